@@ -10,6 +10,7 @@ from .session.store import SessionStore
 from .tools.registry import ToolRegistry
 from .tools.permissions import PermissionGate, PermissionConfig
 from .tools.builtin import register_builtin_tools
+from .tools.builtin_tools.todo_tools import flush_todos
 
 from .mcp.bridge import register_mcp_servers
 
@@ -46,6 +47,14 @@ class AppContext:
                     pass
         except Exception:
             pass
+        try:
+            flush_todos()
+        except Exception:
+            pass
+        try:
+            self.session.close()
+        except Exception:
+            pass
 
     @staticmethod
     def from_env(
@@ -20,6 +20,9 @@ class PromptBuildResult:
     messages: list[dict[str, Any]]
     # If non-empty, the caller may want to append this to the session.
     new_summary_message: Message | None = None
+    # Prompt size relative to the session's running char total: injected system
+    # messages add to it, compaction and truncation subtract from it.
+    char_delta: int = 0
 
 
 def maybe_load_skill(cwd: Path) -> str | None:
@@ -53,6 +56,7 @@ def build_prompt_messages(
 
     msgs = list(session_messages)
     new_summary: Message | None = None
+    char_delta = 0
 
     def _truncate_text(text: str, max_chars: int, *, marker: str = "... (truncated) ...") -> str:
         """Truncate long text by keeping head + tail.
@@ -72,13 +76,19 @@ def build_prompt_messages(
         has_skill = any(m.role == "system" and m.name == SKILL_NAME for m in msgs)
         skill = maybe_load_skill(cwd)
         if skill and not has_skill:
-            msgs.insert(0, Message(role="system", name=SKILL_NAME, content=f"Project SKILL.md:\n\n{skill}"))
+            skill_msg = Message(role="system", name=SKILL_NAME, content=f"Project SKILL.md:\n\n{skill}")
+            msgs.insert(0, skill_msg)
+            char_delta += skill_msg.char_count()
 
     # Phase 2: inject Rules + Agent profile (non-persisted, always at the top).
     if rules_text and rules_text.strip():
-        msgs.insert(0, Message(role="system", name=RULES_NAME, content=f"Rules:\n\n{rules_text.strip()}"))
+        rules_msg = Message(role="system", name=RULES_NAME, content=f"Rules:\n\n{rules_text.strip()}")
+        msgs.insert(0, rules_msg)
+        char_delta += rules_msg.char_count()
     if agent_prompt and agent_prompt.strip():
-        msgs.insert(0, Message(role="system", name=AGENT_NAME, content=agent_prompt.strip()))
+        agent_msg = Message(role="system", name=AGENT_NAME, content=agent_prompt.strip())
+        msgs.insert(0, agent_msg)
+        char_delta += agent_msg.char_count()
 
     # Find latest summary message (acts as a logical cutoff).
     summary_idx = None
@@ -100,6 +110,8 @@ def build_prompt_messages(
         if len(head_to_sum) >= 8:
             sres = summarize(provider, head_to_sum, include_reasoning_content=include_reasoning_content, force_reasoning_content=force_reasoning_content,)
             new_summary = Message(role="system", name=SUMMARY_NAME, content=sres.text)
+            # The caller appends new_summary to the session, so only the dropped head counts here.
+            char_delta -= sum(m.char_count() for m in head)
             msgs = list(tail)
             # Prepend summary; skill injection happens below if enabled.
             msgs.insert(0, new_summary)
@@ -113,7 +125,9 @@ def build_prompt_messages(
                 kept_system.append(m)
             else:
                 kept_other.append(m)
-        kept_other = kept_other[-(policy.max_messages - len(kept_system)) :]
+        keep = policy.max_messages - len(kept_system)
+        char_delta -= sum(m.char_count() for m in kept_other[:-keep])
+        kept_other = kept_other[-keep:]
         msgs = kept_system + kept_other
 
     # Final safety: truncate overly long message contents (including tool results from older sessions).
@@ -127,6 +141,8 @@ def build_prompt_messages(
         if m.role == "tool":
             limit = min(limit, policy.max_tool_result_chars)
         if len(m.content) > limit:
+            truncated = _truncate_text(m.content, limit)
+            char_delta -= len(m.content) - len(truncated)
             safe_msgs.append(
                 Message(
                     role=m.role,
@@ -134,11 +150,11 @@ def build_prompt_messages(
                     tool_call_id=m.tool_call_id,
                     tool_calls=m.tool_calls,
                     reasoning_content=m.reasoning_content,
-                    content=_truncate_text(m.content, limit),
+                    content=truncated,
                 )
             )
         else:
             safe_msgs.append(m)
 
     oai = [m.to_openai(include_reasoning_content=include_reasoning_content, force_reasoning_content=force_reasoning_content) for m in safe_msgs]
-    return PromptBuildResult(messages=oai, new_summary_message=new_summary)
+    return PromptBuildResult(messages=oai, new_summary_message=new_summary, char_delta=char_delta)
@@ -9,6 +9,27 @@ from typing import Any, Callable, Iterator
 
 from ..session.models import AssistantTurn, ToolCall
 
+
+class ProviderHTTPError(RuntimeError):
+    """HTTP error returned by the provider, keeping the status and any Retry-After hint."""
+
+    def __init__(self, message: str, *, status: int, retry_after: float | None = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    # Only the delta-seconds form is honored; HTTP-date values fall back to backoff.
+    if not value:
+        return None
+    try:
+        secs = float(value.strip())
+    except ValueError:
+        return None
+    return secs if secs >= 0 else None
+
+
 @dataclass
 class OpenAICompatProvider:
     """
@@ -145,6 +166,11 @@ class OpenAICompatProvider:
             return turn
         except urllib.error.HTTPError as e:
             body = e.read().decode("utf-8", errors="replace") if hasattr(e, "read") else ""
-            raise RuntimeError(f"Provider HTTPError {e.code}: {e.reason}\n{body}")
+            retry_after = _parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
+            raise ProviderHTTPError(
+                f"Provider HTTPError {e.code}: {e.reason}\n{body}",
+                status=e.code,
+                retry_after=retry_after,
+            )
         except urllib.error.URLError as e:
             raise RuntimeError(f"Provider URLError: {e}")
@@ -16,6 +16,7 @@ from .tools.base import ToolResult
 from .util.ordinal_suffix import ordinal
 from .compaction.policy import CompactionPolicy
 from .compaction.builder import build_prompt_messages
+from .llm.openai_compat import ProviderHTTPError
 
 console = Console()
 
@@ -28,6 +29,12 @@ Rules:
 - Keep tool arguments minimal and correct.
 """
 
+# Number of trailing prompt messages rendered in the --trace input panel.
+TRACE_MAX_MESSAGES = 20
+
+# Upper bound for provider-requested Retry-After waits.
+MAX_RETRY_AFTER_S = 60.0
+
 
 def _tool_specs_to_openai(tools_registry) -> list[dict]:
     out = []
@@ -43,32 +50,36 @@ def _tool_specs_to_openai(tools_registry) -> list[dict]:
     return out
 
 
-def _args_preview(args: dict) -> str:
+def _args_json(args: dict) -> str:
     try:
-        s = json.dumps(args, ensure_ascii=False, indent=2)
+        return json.dumps(args, ensure_ascii=False)
     except Exception:
-        s = str(args)
-    if len(s) > 2000:
-        s = s[:2000] + "\n... (truncated)"
-    return s
+        return str(args)
 
 
-def _prompt_char_count(messages: list[dict]) -> int:
-    total = 0
-    for m in messages:
-        c = m.get("content")
-        if isinstance(c, str):
-            total += len(c)
-        rc = m.get("reasoning_content")
-        if isinstance(rc, str):
-            total += len(rc)
-        tc = m.get("tool_calls")
-        if tc:
-            try:
-                total += len(json.dumps(tc, ensure_ascii=False))
-            except Exception:
-                pass
-    return total
+def _args_preview(args_json: str) -> str:
+    """Permission-prompt preview built from the already-serialized tool arguments."""
+    if len(args_json) > 2000:
+        return args_json[:2000] + "\n... (truncated)"
+    return args_json
+
+
+def _retry_delay(err: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying a failed LLM call.
+
+    Honors a provider Retry-After hint (capped) and falls back to exponential backoff.
+    """
+    if isinstance(err, ProviderHTTPError) and err.retry_after is not None:
+        return min(err.retry_after, MAX_RETRY_AFTER_S)
+    return 0.5 * (2 ** attempt)
+
+
+def _trace_snippet(obj, limit: int = 4000) -> str:
+    try:
+        s = json.dumps(obj, ensure_ascii=False, indent=2)
+    except Exception:
+        s = str(obj)
+    return s[:limit]
 
 
 def _parse_openai_tool_calls(tool_calls: list[dict] | None) -> list[ToolCall]:
@@ -107,7 +118,7 @@ def _clean_invalid_tool_messages(ctx: AppContext) -> int:
         cleaned.append(m)
 
     if removed:
-        ctx.session.messages = cleaned
+        ctx.session.replace_messages(cleaned)
         if ctx.events:
             ctx.events.append(
                 "session.cleaned_invalid_tool_messages",
@@ -119,12 +130,15 @@ def _clean_invalid_tool_messages(ctx: AppContext) -> int:
 # =========================
 # 🔒 NEW: validate outgoing OpenAI-style messages
 # =========================
-def _validate_openai_messages(messages: list[dict]) -> None:
+def _validate_openai_messages(messages: list[dict], start_from: int = 0) -> None:
     """Validate OpenAI/DeepSeek tool-calling protocol:
     - A tool message must be immediately preceded by an assistant message with tool_calls.
     - Tool message should have tool_call_id.
+
+    Messages before `start_from` are assumed to be validated already.
     """
-    for i, m in enumerate(messages):
+    for i in range(max(start_from, 0), len(messages)):
+        m = messages[i]
         role = m.get("role")
         if role == "tool":
             if i == 0:
@@ -167,7 +181,7 @@ def _assert_can_append_tool(ctx: AppContext, tool_call_id: str | None) -> None:
         raise RuntimeError("Protocol violation: tool message missing tool_call_id")
 
 
-def _resume_pending_tool_calls(ctx: AppContext) -> bool:
+def _resume_pending_tool_calls(ctx: AppContext, tctx: ToolContext | None = None) -> bool:
     """Best-effort crash recovery.
 
     If a run crashed after persisting an assistant message that includes tool_calls,
@@ -179,16 +193,18 @@ def _resume_pending_tool_calls(ctx: AppContext) -> bool:
     msgs = ctx.session.messages
     if not msgs:
         return False
+    roles = ctx.session.roles
+    has_tool_calls = ctx.session.has_tool_calls
 
     # Find the most recent assistant message that contains tool_calls.
     last_idx = -1
-    for i in range(len(msgs) - 1, -1, -1):
-        m = msgs[i]
-        if m.role == "assistant" and m.tool_calls:
+    for i in range(len(roles) - 1, -1, -1):
+        role = roles[i]
+        if role == "assistant" and has_tool_calls[i]:
             last_idx = i
             break
         # If we hit a user message, stop scanning: pending tool calls must be after that.
-        if m.role == "user":
+        if role == "user":
             break
     if last_idx < 0:
         return False
@@ -200,27 +216,33 @@ def _resume_pending_tool_calls(ctx: AppContext) -> bool:
 
     # Collect tool_call_ids already answered immediately after the assistant message.
     answered: set[str] = set()
-    for j in range(last_idx + 1, len(msgs)):
-        mj = msgs[j]
-        if mj.role != "tool":
+    tool_call_ids = ctx.session.tool_call_ids
+    for j in range(last_idx + 1, len(roles)):
+        if roles[j] != "tool":
             break
-        if mj.tool_call_id:
-            answered.add(mj.tool_call_id)
+        if tool_call_ids[j]:
+            answered.add(tool_call_ids[j])
 
     pending = [tc for tc in tool_calls if tc.id and tc.id not in answered]
     if not pending:
         return False
+    # Reuse the persisted argument strings for previews instead of re-serializing.
+    raw_args: dict[str, str] = {}
+    for d in assistant.tool_calls or []:
+        arg_str = (d.get("function") or {}).get("arguments")
+        if isinstance(arg_str, str):
+            raw_args[str(d.get("id") or "")] = arg_str
 
     # ✅ Safety: only resume if there are no non-tool messages between assistant and end,
     # except already appended contiguous tool messages.
     # That is: msgs[last_idx+1 : ] must be all tool messages.
-    for j in range(last_idx + 1, len(msgs)):
-        if msgs[j].role != "tool":
+    for j in range(last_idx + 1, len(roles)):
+        if roles[j] != "tool":
             # If anything else appears, refuse to resume to avoid illegal ordering.
             if ctx.events:
                 ctx.events.append(
                     "resume.aborted_non_tool_after_assistant",
-                    {"assistant_index": last_idx, "found_role": msgs[j].role, "found_index": j},
+                    {"assistant_index": last_idx, "found_role": roles[j], "found_index": j},
                 )
             return False
 
@@ -230,6 +252,9 @@ def _resume_pending_tool_calls(ctx: AppContext) -> bool:
             {"count": len(pending), "assistant_index": last_idx, "tool_call_ids": [tc.id for tc in pending]},
         )
 
+    if tctx is None:
+        tctx = ToolContext(cwd=str(ctx.cwd), session_id=ctx.session.session_id)
+
     # Execute missing tool calls sequentially.
     for tc in pending:
         tool = ctx.tools.get_optional(tc.name)
@@ -241,7 +266,7 @@ def _resume_pending_tool_calls(ctx: AppContext) -> bool:
             continue
 
         args = tc.arguments or {}
-        preview = _args_preview(args)
+        preview = _args_preview(raw_args.get(tc.id) or _args_json(args))
 
         allowed = ctx.permissions.decide(tool.spec.permission_key, tool.spec.name, preview)
         if not allowed:
@@ -250,7 +275,6 @@ def _resume_pending_tool_calls(ctx: AppContext) -> bool:
             ctx.session.append(Message(role="tool", content=denied_msg, tool_call_id=tc.id))
             continue
 
-        tctx = ToolContext(cwd=str(ctx.cwd), session_id=ctx.session.session_id)
         t0 = time.perf_counter()
         try:
             res: ToolResult = tool.execute(tctx, args)
@@ -287,17 +311,20 @@ def run_agent_once(
     # 🔒 Clean any persisted invalid tool messages FIRST (fix old polluted sessions)
     _clean_invalid_tool_messages(ctx)
 
+    # Invariant for the whole run; shared by every tool call below.
+    tctx = ToolContext(cwd=str(ctx.cwd), session_id=ctx.session.session_id)
+
     # Phase 2: allow agent to override max_steps.
     if ctx.agent and ctx.agent.max_steps is not None:
         max_steps = ctx.agent.max_steps
 
     # Ensure system prompt at beginning (only once per session file)
-    if not any(m.role == "system" for m in ctx.session.messages):
+    if "system" not in ctx.session.roles:
         ctx.session.append(Message(role="system", content=SYSTEM_PROMPT))
 
     # Crash recovery: best-effort, protocol-safe
     if resume:
-        _resume_pending_tool_calls(ctx)
+        _resume_pending_tool_calls(ctx, tctx)
         # Resume may append tools; clean again defensively
         _clean_invalid_tool_messages(ctx)
 
@@ -309,6 +336,10 @@ def run_agent_once(
     step = 0
     final_text = ""
     policy = CompactionPolicy()
+    # Incremental validation: length of the prompt prefix validated on the previous step,
+    # plus its first/last dicts to detect when the builder rewrote or shifted that prefix.
+    validated_prefix = 0
+    validated_ends: tuple[dict, dict] | None = None
 
     provider_name = (getattr(ctx.provider, "provider_name", "") or "").lower()
     is_deepseek = ("deepseek" in provider_name) or ("deepseek" in model_name)
@@ -353,7 +384,18 @@ def run_agent_once(
             prompt_res.messages = _clean_invalid_tool_dict_messages(prompt_res.messages)
 
             # 🔒 Validate outgoing messages BEFORE calling provider (catch locally)
-            _validate_openai_messages(prompt_res.messages)
+            pm = prompt_res.messages
+            if (
+                prompt_res.new_summary_message is not None
+                or validated_ends is None
+                or len(pm) < validated_prefix
+                or pm[0] != validated_ends[0]
+                or pm[validated_prefix - 1] != validated_ends[1]
+            ):
+                validated_prefix = 0
+            _validate_openai_messages(pm, start_from=validated_prefix)
+            validated_prefix = len(pm)
+            validated_ends = (pm[0], pm[-1]) if pm else None
 
             if ctx.events:
                 ctx.events.append(
@@ -363,7 +405,7 @@ def run_agent_once(
                         "model": ctx.provider.model,
                         "messages_count": len(prompt_res.messages),
                         "tools_count": len(tools),
-                        "prompt_chars": _prompt_char_count(prompt_res.messages),
+                        "prompt_chars": ctx.session.char_total + prompt_res.char_delta,
                     },
                 )
 
@@ -391,7 +433,8 @@ def run_agent_once(
 
             # Robustness: retry transient provider failures a few times.
             last_err: Exception | None = None
-            for attempt in range(3):
+            max_attempts = 3
+            for attempt in range(max_attempts):
                 try:
                     t0 = time.perf_counter()
                     turn = _chat_once()
@@ -405,7 +448,8 @@ def run_agent_once(
                             "llm.error",
                             {"step": step, "attempt": attempt + 1, "error": str(e)[:2000]},
                         )
-                    time.sleep(0.5 * (2 ** attempt))
+                    if attempt + 1 < max_attempts:
+                        time.sleep(_retry_delay(e, attempt))
 
             if last_err is not None:
                 # Persist error into the session for reproducibility.
@@ -441,7 +485,7 @@ def run_agent_once(
                     "type": "function",
                     "function": {
                         "name": tc.name,
-                        "arguments": json.dumps(tc.arguments or {}, ensure_ascii=False),
+                        "arguments": _args_json(tc.arguments or {}),
                     },
                 })
 
@@ -476,7 +520,8 @@ def run_agent_once(
 
             console.print(
                 Panel.fit(
-                    json.dumps(prompt_res.messages, ensure_ascii=False, indent=2)[:4000],
+                    # Only the tail of the prompt is shown, so only the tail is serialized.
+                    _trace_snippet(prompt_res.messages[-TRACE_MAX_MESSAGES:]),
                     title="LLM INPUT (messages)",
                     border_style="cyan",
                 )
@@ -492,7 +537,7 @@ def run_agent_once(
             }
             console.print(
                 Panel.fit(
-                    json.dumps(llm_output, ensure_ascii=False, indent=2)[:4000],
+                    _trace_snippet(llm_output),
                     title="LLM OUTPUT",
                     border_style="magenta",
                 )
@@ -516,10 +561,10 @@ def run_agent_once(
         step += 1
 
         # Execute tool calls sequentially
-        for tc in turn.tool_calls:
+        for tc, echo in zip(turn.tool_calls, assistant_tool_calls):
             tool = ctx.tools.get_optional(tc.name)
             args = tc.arguments or {}
-            preview = _args_preview(args)
+            preview = _args_preview(echo["function"]["arguments"])
 
             if tool is None:
                 # Still respond with tool message to satisfy protocol
@@ -558,7 +603,6 @@ def run_agent_once(
                 ctx.session.append(Message(role="tool", content=denied_msg, tool_call_id=tc.id))
                 continue
 
-            tctx = ToolContext(cwd=str(ctx.cwd), session_id=ctx.session.session_id)
             t0 = time.perf_counter()
             try:
                 res: ToolResult = tool.execute(tctx, args)
@@ -4,7 +4,7 @@ from typing import Any, Literal
 
 Role = Literal["system", "user", "assistant", "tool"]
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     role: Role
     # content can be null in some OpenAI-compatible APIs when tool_calls are present
@@ -15,8 +15,28 @@ class Message:
     tool_calls: list[dict[str, Any]] | None = None
     # DeepSeek thinking-with-tools compatibility
     reasoning_content: str | None = None
+    # Memoized to_openai() results keyed by (include_reasoning_content, force_reasoning_content).
+    # Messages are not mutated once appended to a session, so the cache never goes stale.
+    _openai_cache: dict[tuple[bool, bool], dict[str, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Persisted (jsonl) representation; accepted back by Message(**d)."""
+        return {
+            "role": self.role,
+            "content": self.content,
+            "name": self.name,
+            "tool_call_id": self.tool_call_id,
+            "tool_calls": self.tool_calls,
+            "reasoning_content": self.reasoning_content,
+        }
 
     def to_openai(self, *, include_reasoning_content: bool = False, force_reasoning_content: bool = False) -> dict[str, Any]:
+        key = (bool(include_reasoning_content), bool(force_reasoning_content))
+        cached = self._openai_cache.get(key)
+        if cached is not None:
+            return cached
         d: dict[str, Any] = {"role": self.role, "content": self.content}
         # "name" is not part of tool messages in many OpenAI-compatible APIs
         if self.name and self.role != "tool":
@@ -29,8 +49,22 @@ class Message:
             # DeepSeek (thinking mode) may require reasoning_content for all assistant messages
             if force_reasoning_content or (include_reasoning_content and self.tool_calls is not None):
                 d["reasoning_content"] = self.reasoning_content or ""
+        self._openai_cache[key] = d
         return d
 
+    def char_count(self) -> int:
+        """Approximate prompt size of this message (content + reasoning + tool call arguments).
+
+        reasoning_content is only stored when the provider gets it sent back (DeepSeek
+        thinking-with-tools), so it is counted whenever present.
+        """
+        total = len(self.content or "") + len(self.reasoning_content or "")
+        for tc in self.tool_calls or ():
+            args = (tc.get("function") or {}).get("arguments")
+            if isinstance(args, str):
+                total += len(args)
+        return total
+
 @dataclass
 class ToolCall:
     id: str
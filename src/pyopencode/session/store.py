@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable, Any
 
@@ -22,6 +24,28 @@ class SessionStore:
     session_id: str
     path: Path
     messages: list[Message]
+    # Running sum of Message.char_count() over `messages`, kept in sync by append().
+    char_total: int = field(default=0, init=False, repr=False, compare=False)
+    # Parallel per-message columns (same indices as `messages`) for cheap role scans.
+    roles: list[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    tool_call_ids: list[str | None] = field(default_factory=list, init=False, repr=False, compare=False)
+    has_tool_calls: list[bool] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Append-only fd, opened lazily on first append and reused afterwards.
+    _fd: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self.char_total = sum(m.char_count() for m in self.messages)
+        self.roles = [m.role for m in self.messages]
+        self.tool_call_ids = [m.tool_call_id for m in self.messages]
+        self.has_tool_calls = [bool(m.tool_calls) for m in self.messages]
+
+    def replace_messages(self, msgs: list[Message]) -> None:
+        """Replace the in-memory message list (the jsonl file is left untouched)."""
+        self.messages = msgs
+        self._reindex()
 
     @staticmethod
     def open(session_id: str | None = None) -> "SessionStore":
@@ -43,18 +67,33 @@ class SessionStore:
 
     def append(self, msg: Message) -> None:
         self.messages.append(msg)
-        # Crash-safety: append + flush + fsync so that resume logic can reliably
+        self.char_total += msg.char_count()
+        self.roles.append(msg.role)
+        self.tool_call_ids.append(msg.tool_call_id)
+        self.has_tool_calls.append(bool(msg.tool_calls))
+        # Crash-safety: O_APPEND write + fsync so that resume logic can reliably
         # detect persisted assistant tool calls.
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(msg.__dict__, ensure_ascii=False) + "\n")
-            f.flush()
-            try:
-                import os
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            atexit.register(self.close)
+        data = memoryview((json.dumps(msg.to_dict(), ensure_ascii=False) + "\n").encode("utf-8"))
+        while data:
+            data = data[os.write(self._fd, data):]
+        try:
+            os.fsync(self._fd)
+        except Exception:
+            # Best-effort: some filesystems may not support fsync.
+            pass
 
-                os.fsync(f.fileno())
-            except Exception:
-                # Best-effort: some filesystems may not support fsync.
-                pass
+    def close(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+        atexit.unregister(self.close)
 
     def extend(self, msgs: Iterable[Message]) -> None:
         for m in msgs:
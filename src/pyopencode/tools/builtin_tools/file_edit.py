@@ -5,7 +5,21 @@ from pathlib import Path
 from typing import Any
 
 from ..base import ToolSpec, ToolResult, ToolContext
-from ...util.fs import resolve_path, read_text, FsError
+from ...util.fs import resolve_path, read_text, split_lines, write_bytes, FsError
+
+
+def replace_lines(lines: list[str], start: int, end: int, new_text: str) -> tuple[list[str], int]:
+    """Replace 1-based inclusive lines start..end with new_text; returns (lines, clamped_end).
+
+    Raises ValueError for an invalid range.
+    """
+    if start < 1 or end < start or start > len(lines) + 1:
+        raise ValueError(f"Invalid line range {start}-{end} for file with {len(lines)} lines.")
+    # allow end == len(lines)+1 as append at EOF (treat as empty replacement at end)
+    end = min(end, len(lines))
+    if "\r" in new_text:
+        new_text = new_text.replace("\r\n", "\n").replace("\r", "\n")
+    return lines[:start-1] + split_lines(new_text) + lines[end:], end
 
 @dataclass
 class EditFileTool:
@@ -40,15 +54,9 @@ class EditFileTool:
             return ToolResult(f"File not found: {path}", is_error=True)
 
         text = read_text(p)
-        lines = text.splitlines()
-        if start < 1 or end < start or start > len(lines) + 1:
-            return ToolResult(f"Invalid line range {start}-{end} for file with {len(lines)} lines.", is_error=True)
-        # allow end == len(lines)+1 as append at EOF (treat as empty replacement at end)
-        end = min(end, len(lines))
-
-        before = lines[:start-1]
-        after = lines[end:]
-        new_lines = new_text.splitlines()
-        merged = before + new_lines + after
-        p.write_text("\n".join(merged) + ("\n" if text.endswith("\n") else ""), encoding="utf-8")
+        try:
+            merged, end = replace_lines(split_lines(text), start, end, new_text)
+        except ValueError as e:
+            return ToolResult(str(e), is_error=True)
+        write_bytes(p, ("\n".join(merged) + ("\n" if text.endswith("\n") else "")).encode("utf-8"))
         return ToolResult(f"Edited {path}: replaced lines {start}-{end}.")
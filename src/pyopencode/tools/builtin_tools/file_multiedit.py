@@ -1,10 +1,12 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
 from ..base import ToolSpec, ToolResult, ToolContext
-from .file_edit import EditFileTool
+from ...util.fs import resolve_path, read_text, split_lines, write_bytes, FsError
+from .file_edit import replace_lines
 
 @dataclass
 class MultiEditFileTool:
@@ -46,10 +48,20 @@ class MultiEditFileTool:
             if s2 <= e1:
                 return ToolResult("edits must not overlap", is_error=True)
 
-        # apply from bottom to top to keep line numbers stable
-        editor = EditFileTool()
+        try:
+            p = resolve_path(Path(ctx.cwd), path)
+        except FsError as e:
+            return ToolResult(str(e), is_error=True)
+        if not p.exists() or not p.is_file():
+            return ToolResult(f"File not found: {path}", is_error=True)
+
+        # Apply all edits in memory (bottom to top keeps line numbers stable), then write once.
+        text = read_text(p)
+        lines = split_lines(text)
         for e in reversed(edits):
-            res = editor.execute(ctx, {"path": path, **e})
-            if res.is_error:
-                return res
+            try:
+                lines, _ = replace_lines(lines, int(e["start_line"]), int(e["end_line"]), e["new_text"])
+            except ValueError as err:
+                return ToolResult(str(err), is_error=True)
+        write_bytes(p, ("\n".join(lines) + ("\n" if text.endswith("\n") else "")).encode("utf-8"))
         return ToolResult(f"Applied {len(edits)} edits to {path}.")
@@ -3,9 +3,64 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+import mmap
+import os
+import re
 
 from ..base import ToolSpec, ToolResult, ToolContext
-from ...util.fs import resolve_path, read_text, FsError
+from ...util.fs import resolve_path, read_text, split_lines, FsError
+
+# Ranged reads of files larger than this walk newlines in an mmap instead of decoding the whole file.
+_MMAP_RANGE_MIN_BYTES = 1024 * 1024
+# A CR that does not start a CRLF is a line break of its own for read_text().
+_LONE_CR = re.compile(rb"\r(?!\n)")
+
+
+def _read_range(path: Path, start: int, end: int | None) -> str | None:
+    """Return lines start..end (1-based, inclusive; end=None means EOF) joined by newlines.
+
+    Only the bytes up to the end of the range are touched, and only the range is decoded.
+    Returns None when those bytes contain a lone CR (old Mac line endings): line numbers
+    then differ from a LF count, and the caller falls back to read_text().
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return ""
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            pos = 0
+            for _ in range(start - 1):
+                nxt = mm.find(b"\n", pos)
+                if nxt < 0:
+                    pos = size
+                    break
+                pos = nxt + 1
+            if pos >= size:
+                # Past EOF by LF count; with lone CRs the file may still have that many lines.
+                return "" if _LONE_CR.search(mm) is None else None
+            start_off = pos
+            if end is None:
+                end_off = size - 1 if mm[size - 1] == 0x0A else size
+            else:
+                end_off = start_off
+                for _ in range(end - start + 1):
+                    nxt = mm.find(b"\n", pos)
+                    if nxt < 0:
+                        if pos < size:
+                            end_off = size
+                        break
+                    end_off = nxt
+                    pos = nxt + 1
+            if _LONE_CR.search(mm, 0, min(size, end_off + 1)) is not None:
+                return None
+            data = mm[start_off:end_off]
+    # Match read_text(): undecodable bytes are replaced and CRLF reads as LF; the last line's
+    # CR belongs to the LF at end_off.
+    out = data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+    return out[:-1] if out.endswith("\r") else out
+
 
 @dataclass
 class ReadFileTool:
@@ -35,21 +90,28 @@ class ReadFileTool:
         if not p.exists() or not p.is_file():
             return ToolResult(f"File not found: {path}", is_error=True)
 
-        text = read_text(p)
-        lines = text.splitlines()
-
         s = args.get("start_line")
         e = args.get("end_line")
-        if s is not None or e is not None:
-            s = int(s or 1)
-            e = int(e or len(lines))
-            s = max(1, s)
-            e = min(len(lines), e)
-            excerpt = lines[s-1:e]
-        else:
-            excerpt = lines
-
-        out = "\n".join(excerpt)
+        out: str | None = None
+        if s is None and e is None:
+            # Whole file: no need to split into lines and join them back.
+            text = read_text(p)
+            out = text[:-1] if text.endswith("\n") else text
+        elif p.stat().st_size > _MMAP_RANGE_MIN_BYTES:
+            out = _read_range(p, max(1, int(s or 1)), int(e) if e else None)
+        if out is None:
+            text = read_text(p)
+            s = max(1, int(s or 1))
+            if e:
+                # Split at most `e` times: only the lines up to end_line are materialized.
+                e = int(e)
+                lines = text.split("\n", e) if e > 0 else []
+                if len(lines) <= e and lines and not lines[-1]:
+                    lines.pop()  # trailing newline, not an extra empty line
+                excerpt = lines[s-1:e]
+            else:
+                excerpt = split_lines(text)[s-1:]
+            out = "\n".join(excerpt)
         max_chars = int(args.get("max_chars", 40000))
         if len(out) > max_chars:
             out = out[:max_chars] + "\n... (truncated)"
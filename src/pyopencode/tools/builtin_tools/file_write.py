@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Any
 
 from ..base import ToolSpec, ToolResult, ToolContext
-from ...util.fs import resolve_path, FsError
+from ...util.fs import resolve_path, write_bytes, FsError
 
 @dataclass
 class WriteFileTool:
@@ -35,5 +35,6 @@ class WriteFileTool:
             return ToolResult(str(e), is_error=True)
         if mkdirs:
             p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(content, encoding="utf-8")
-        return ToolResult(f"Wrote {path} ({len(content)} chars).")
+        data = content.encode("utf-8")
+        write_bytes(p, data)
+        return ToolResult(f"Wrote {path} ({len(data)} bytes).")
@@ -4,8 +4,30 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 import glob as _glob
+import os
 
 from ..base import ToolSpec, ToolResult, ToolContext
+from ...util.fs import is_within_cwd
+from ...util.ignore import load_ignore
+
+
+def _literal_base(pattern: str, cwd_str: str) -> str:
+    """cwd-relative '/'-separated path formed by the pattern's leading non-wildcard parts."""
+    parts: list[str] = []
+    for part in pattern.replace(os.sep, "/").split("/"):
+        if _glob.has_magic(part):
+            break
+        parts.append(part)
+    if not parts:
+        return ""
+    base = "/".join(parts) or "/"
+    if os.path.isabs(base):
+        base = os.path.relpath(base, cwd_str)
+    base = os.path.normpath(base)
+    if base == os.curdir:
+        return ""
+    return base.replace(os.sep, "/") if os.sep != "/" else base
+
 
 @dataclass
 class GlobTool:
@@ -18,23 +40,43 @@ class GlobTool:
             "properties": {
                 "pattern": {"type": "string", "description": "Glob pattern, e.g. 'src/**/*.py'."},
                 "max_results": {"type": "integer", "default": 200},
+                "respect_gitignore": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Skip paths ignored by .gitignore (plus .git/, __pycache__/, *.pyc).",
+                },
             },
             "required": ["pattern"],
         },
     )
 
     def execute(self, ctx: ToolContext, args: dict[str, Any]) -> ToolResult:
-        cwd = Path(ctx.cwd)
+        cwd_str = str(Path(ctx.cwd))
         pattern = args["pattern"]
         max_results = int(args.get("max_results", 200))
-        full = str((cwd / pattern))
-        matches = _glob.glob(full, recursive=True)
+        ignore = load_ignore(cwd_str) if args.get("respect_gitignore", True) else None
+        # Like grep's `path`, a directory spelled out in the pattern is searched even if ignored;
+        # only what lies below it is filtered.
+        base = _literal_base(pattern, cwd_str) if ignore is not None else ""
+        dir_cache: dict[str, bool] = {}
+        # iglob with root_dir yields cwd-relative strings lazily, so we can stop at max_results
+        # without listing the rest of the tree or resolving every match.
         rel = []
-        for m in matches:
-            try:
-                rel.append(str(Path(m).resolve().relative_to(cwd.resolve())))
-            except Exception:
+        for m in _glob.iglob(pattern, root_dir=cwd_str, recursive=True):
+            if os.path.isabs(m):
+                m = os.path.relpath(m, cwd_str)
+            m = os.path.normpath(m)
+            if m == os.pardir or m.startswith(os.pardir + os.sep):
+                continue
+            full = os.path.join(cwd_str, m)
+            # Symlinks may point outside the workspace: keep only matches that resolve inside it.
+            if not is_within_cwd(cwd_str, full):
                 continue
+            if ignore is not None:
+                key = m.replace(os.sep, "/") if os.sep != "/" else m
+                if ignore.is_ignored(key, os.path.isdir(full), dir_cache, base):
+                    continue
+            rel.append(m)
             if len(rel) >= max_results:
                 break
         return ToolResult("\n".join(rel) if rel else "(no matches)")
@@ -1,12 +1,189 @@
 
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+import fnmatch
+import mmap
+import os
 import re
 
 from ..base import ToolSpec, ToolResult, ToolContext
-from ...util.fs import resolve_path, read_text, FsError
+from ...util.fs import resolve_path, read_text, split_lines, FsError
+from ...util.ignore import IgnoreSpec, load_ignore
+
+# Files at least this large are scanned through mmap; smaller ones are cheaper to read whole.
+_MMAP_MIN_BYTES = 16 * 1024
+# Leading bytes inspected for NUL to detect binary files.
+_SNIFF_BYTES = 8 * 1024
+_DEFAULT_MAX_FILE_BYTES = 16 * 1024 * 1024
+_GREP_WORKERS = min(8, os.cpu_count() or 4)
+# Window used when counting newlines between matches (bounds the transient slice copies).
+_COUNT_CHUNK_BYTES = 1024 * 1024
+# A "regex" without any of these is a plain literal and can use substring search instead of `re`.
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+# fnmatch.fnmatch() compares os.path.normcase()d names: case-insensitive on Windows.
+_INCLUDE_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+# A CR that does not start a CRLF is a line break of its own for read_text().
+_LONE_CR = re.compile(rb"\r(?!\n)")
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str | bytes, flags: int = 0) -> re.Pattern:
+    # Module-local, bounded cache: repeated grep patterns skip recompilation without
+    # depending on (or churning) the global `re` cache.
+    return re.compile(pattern, flags)
+
+
+def _scandir_recursive(
+    path: str,
+    ignore: IgnoreSpec | None = None,
+    root_len: int = 0,
+) -> Iterator[os.DirEntry]:
+    """Yield regular files under `path`, reusing DirEntry type info (no extra stat per entry).
+
+    Symlinks are skipped; unreadable directories are ignored. With `ignore`, entries are
+    matched by their path minus the first `root_len` chars, and ignored directories are
+    pruned without being listed.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if ignore is not None:
+                    rel = entry.path[root_len:]
+                    if os.sep != "/":
+                        rel = rel.replace(os.sep, "/")
+                    if ignore.match(rel, is_dir):
+                        continue
+                if is_dir:
+                    yield from _scandir_recursive(entry.path, ignore, root_len)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return
+
+
+def _count_newlines(mm: mmap.mmap, start: int, end: int) -> int:
+    """Count b"\\n" in mm[start:end] with C-level bytes.count over bounded windows."""
+    n = 0
+    while start < end:
+        stop = min(end, start + _COUNT_CHUNK_BYTES)
+        n += mm[start:stop].count(b"\n")
+        start = stop
+    return n
+
+
+def _grep_mmap(path: str, needle: bytes, max_matches: int) -> list[tuple[int, str]] | None:
+    r"""Scan a file's bytes in place and return (line_no, line) for each line containing `needle`.
+
+    Hits are located by `mm.find` directly on the mapped buffer; only matching lines are decoded.
+    Only single-line literals come here: a regex could span a newline or a CRLF's "", and
+    bytes character classes are ASCII-only, so patterns stay on the per-line str path.
+    Lines are numbered by b"
+"; returns None when the file has a lone CR (a line break for
+    read_text()), so the caller can fall back to the str path and keep numbering consistent.
+    """
+    out: list[tuple[int, str]] = []
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return out
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if _LONE_CR.search(mm) is not None:
+                return None
+            pos = 0
+            line_no = 1
+            counted = 0  # newlines are counted up to this offset
+            while pos < size and len(out) < max_matches:
+                start = mm.find(needle, pos)
+                if start < 0:
+                    break
+                line_no += _count_newlines(mm, counted, start)
+                line_start = mm.rfind(b"\n", 0, start) + 1
+                line_end = mm.find(b"\n", start)
+                if line_end < 0:
+                    line_end = size
+                line = mm[line_start:line_end].decode("utf-8", errors="replace").rstrip("\r")
+                out.append((line_no, line))
+                # Continue on the next line: one hit per line, like the line-by-line path.
+                pos = line_end + 1
+                counted = pos
+                line_no += 1
+    finally:
+        os.close(fd)
+    return out
+
+@dataclass(frozen=True)
+class _GrepQuery:
+    rx: re.Pattern[str] | None
+    needle: str
+    # Byte-level literal for the mmap path (only meaningful when use_mmap).
+    needle_bytes: bytes
+    use_mmap: bool
+    # Larger files are skipped entirely; None (an explicitly named file) means no limit.
+    max_file_bytes: int | None = _DEFAULT_MAX_FILE_BYTES
+
+
+def _grep_file(fpath: str, cwd_str: str, q: _GrepQuery, max_matches: int) -> list[str]:
+    """Search one file; returns formatted "rel:line: text" hits (at most max_matches).
+
+    Self-contained so it can run on a worker thread.
+    """
+    # Paths come from the resolved target, so a string relpath is enough (no resolve()).
+    rel = os.path.relpath(fpath, cwd_str)
+    out: list[str] = []
+    # Size filter + binary sniff (a NUL in the first block means binary, as grep/ripgrep do).
+    try:
+        fd = os.open(fpath, os.O_RDONLY)
+    except OSError:
+        return out
+    try:
+        size = os.fstat(fd).st_size
+        if q.max_file_bytes is not None and size > q.max_file_bytes:
+            return out
+        head = os.read(fd, _SNIFF_BYTES)
+    except OSError:
+        return out
+    finally:
+        os.close(fd)
+    if b"\x00" in head:
+        return out
+    if q.use_mmap and size >= _MMAP_MIN_BYTES:
+        try:
+            hits = _grep_mmap(fpath, q.needle_bytes, max_matches)
+        except (OSError, ValueError):
+            return out
+        if hits is not None:
+            return [f"{rel}:{i}: {line}" for i, line in hits]
+    if len(head) >= size:
+        # The sniffed block is the whole file: decode it like read_text() (universal newlines).
+        text = head.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    else:
+        try:
+            text = read_text(Path(fpath))
+        except Exception:
+            return out
+    lines = split_lines(text)
+    rx_search = q.rx.search if q.rx is not None else None
+    needle = q.needle
+    i = 0
+    for line in lines:
+        i += 1
+        hit = (rx_search(line) is not None) if rx_search else (needle in line)
+        if hit:
+            out.append(f"{rel}:{i}: {line}")
+            if len(out) >= max_matches:
+                break
+    return out
+
 
 @dataclass
 class GrepTool:
@@ -22,6 +199,16 @@ class GrepTool:
                 "regex": {"type": "boolean", "default": True},
                 "include": {"type": "string", "description": "Optional glob filter like '*.py'."},
                 "max_matches": {"type": "integer", "default": 200},
+                "max_file_bytes": {
+                    "type": "integer",
+                    "default": _DEFAULT_MAX_FILE_BYTES,
+                    "description": "Skip files larger than this many bytes when searching a directory.",
+                },
+                "respect_gitignore": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Skip paths ignored by .gitignore (plus .git/, __pycache__/, *.pyc).",
+                },
             },
             "required": ["pattern"],
         },
@@ -34,6 +221,8 @@ class GrepTool:
         is_regex = bool(args.get("regex", True))
         include = args.get("include")
         max_matches = int(args.get("max_matches", 200))
+        max_file_bytes = int(args.get("max_file_bytes", _DEFAULT_MAX_FILE_BYTES))
+        respect_gitignore = bool(args.get("respect_gitignore", True))
 
         try:
             target = resolve_path(cwd, path)
@@ -42,38 +231,66 @@ class GrepTool:
         if not target.exists():
             return ToolResult(f"Path not found: {path}", is_error=True)
 
-        file_list: list[Path] = []
-        if target.is_file():
-            file_list = [target]
+        cwd_str = str(cwd)
+        file_list: list[str] = []
+        single_file = target.is_file()
+        if single_file:
+            file_list = [str(target)]
         else:
-            # walk
-            for p in target.rglob("*"):
-                if not p.is_file():
+            # walk; ignored subtrees are pruned before they are listed
+            ignore = load_ignore(cwd_str) if respect_gitignore else None
+            # Plain name patterns are translated to a regex once and matched against the entry
+            # name; patterns with a "/" keep Path.match semantics.
+            inc_rx = None
+            if include and "/" not in include:
+                inc_rx = _compile(fnmatch.translate(include), _INCLUDE_FLAGS)
+            for entry in _scandir_recursive(str(target), ignore, len(os.path.join(cwd_str, ""))):
+                if inc_rx is not None:
+                    if not inc_rx.match(entry.name):
+                        continue
+                elif include and not Path(entry.path).match(include):
                     continue
-                if include and not p.match(include):
-                    continue
-                file_list.append(p)
+                file_list.append(entry.path)
+
+        if is_regex and not _REGEX_META.intersection(pattern):
+            # Literal pattern: `in` / mm.find (memchr-based) beat the backtracking engine.
+            is_regex = False
 
         rx = None
         if is_regex:
             try:
-                rx = re.compile(pattern)
+                rx = _compile(pattern)
             except re.error as e:
                 return ToolResult(f"Invalid regex: {e}", is_error=True)
 
-        out_lines = []
-        count = 0
-        for f in file_list:
-            try:
-                text = read_text(f)
-            except Exception:
-                continue
-            for i, line in enumerate(text.splitlines(), start=1):
-                hit = (rx.search(line) is not None) if rx else (pattern in line)
-                if hit:
-                    rel = str(f.resolve().relative_to(cwd))
-                    out_lines.append(f"{rel}:{i}: {line}")
-                    count += 1
-                    if count >= max_matches:
-                        return ToolResult("\n".join(out_lines))
+        # Only ASCII literals that cannot straddle a line break are searched on the mapped bytes;
+        # regexes keep str semantics (Unicode classes, "$" before "\r", no match across lines).
+        use_mmap = rx is None and pattern.isascii() and "\n" not in pattern and "\r" not in pattern
+        needle = pattern.encode("ascii") if use_mmap else b""
+
+        q = _GrepQuery(
+            rx=rx,
+            needle=pattern,
+            needle_bytes=needle,
+            use_mmap=use_mmap,
+            # The size cap only prunes a directory walk; a file named by `path` is always searched.
+            max_file_bytes=None if single_file else max_file_bytes,
+        )
+
+        out_lines: list[str] = []
+        if len(file_list) <= 1:
+            for fpath in file_list:
+                out_lines.extend(_grep_file(fpath, cwd_str, q, max_matches))
+            return ToolResult("\n".join(out_lines) if out_lines else "(no matches)")
+
+        # Fan out per-file work; results are consumed in file order so output stays deterministic.
+        with ThreadPoolExecutor(max_workers=_GREP_WORKERS) as exe:
+            futures = [exe.submit(_grep_file, fpath, cwd_str, q, max_matches) for fpath in file_list]
+            for fut in futures:
+                out_lines.extend(fut.result())
+                if len(out_lines) >= max_matches:
+                    del out_lines[max_matches:]
+                    for rest in futures:
+                        rest.cancel()
+                    return ToolResult("\n".join(out_lines))
         return ToolResult("\n".join(out_lines) if out_lines else "(no matches)")
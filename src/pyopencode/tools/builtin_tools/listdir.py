@@ -38,23 +38,39 @@ class ListDirTool:
         if not p.is_dir():
             return ToolResult(f"Not a directory: {path}", is_error=True)
 
+        # `p` is already resolved under cwd, so string relpaths are enough (no resolve() per entry).
+        cwd_str = str(cwd)
         entries = []
         if recursive:
-            for root, dirs, files in os.walk(p):
-                rootp = Path(root)
-                for d in dirs:
-                    entries.append(str((rootp / d).resolve().relative_to(cwd)))
+            # Same order as os.walk (per directory: dirs, then files; depth-first), but driven by
+            # an explicit scandir stack so we stop listing as soon as max_entries is reached.
+            stack = [str(p)]
+            while stack and len(entries) < max_entries:
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        children = list(it)
+                except OSError:
+                    continue
+                dirs = []
+                files = []
+                for child in children:
+                    try:
+                        is_dir = child.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(child)
+                for child in dirs + files:
+                    entries.append(os.path.relpath(child.path, cwd_str))
                     if len(entries) >= max_entries:
                         break
-                for f in files:
-                    entries.append(str((rootp / f).resolve().relative_to(cwd)))
-                    if len(entries) >= max_entries:
-                        break
-                if len(entries) >= max_entries:
-                    break
+                # Like os.walk(followlinks=False): list symlinked dirs but do not descend into them.
+                stack.extend(d.path for d in reversed(dirs) if not d.is_symlink())
         else:
-            for child in sorted(p.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower())):
-                entries.append(str(child.resolve().relative_to(cwd)))
+            with os.scandir(p) as it:
+                children = list(it)
+            # DirEntry.is_dir() uses the cached d_type, so sorting costs no extra stat calls.
+            for child in sorted(children, key=lambda e: (not e.is_dir(), e.name.lower())):
+                entries.append(os.path.relpath(child.path, cwd_str))
                 if len(entries) >= max_entries:
                     break
 
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import itertools
 import json
+import py_compile
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +19,17 @@ def _as_int(v: Any, default: int) -> int:
         return default
 
 
+@lru_cache(maxsize=64)
+def _script(path_str: str, mtime_ns: int, size: int):
+    """jedi.Script for a file version; (mtime_ns, size) in the key invalidates edited files.
+
+    Reusing the Script also reuses Jedi's parse tree and inference caches across calls.
+    """
+    import jedi  # type: ignore
+
+    return jedi.Script(code=read_text(Path(path_str)), path=path_str)
+
+
 @dataclass
 class LspTool:
     """Phase 4: lightweight code navigation.
@@ -77,7 +91,6 @@ class LspTool:
                 is_error=True,
             )
 
-        code = read_text(path)
         line = _as_int(args.get("line"), 1)
         column = _as_int(args.get("column"), 0)
         limit = max(1, min(_as_int(args.get("limit"), 50), 200))
@@ -89,31 +102,33 @@ class LspTool:
             return ToolResult(content=f"Missing dependency jedi: {e}", is_error=True)
 
         try:
-            script = jedi.Script(code=code, path=str(path))
+            script = None
+            if action != "diagnostics":
+                st = path.stat()
+                script = _script(str(path), st.st_mtime_ns, st.st_size)
             results: list[dict[str, Any]] = []
 
             if action == "symbols":
                 names = script.get_names(all_scopes=True, definitions=True, references=False)
-                for n in names:
-                    nm = (n.name or "")
-                    if query and query not in nm.lower():
-                        continue
+                # Filter lazily and stop at `limit`; each name is read/lowered once.
+                pairs = ((n, n.name or "") for n in names)
+                if query:
+                    pairs = ((n, nm) for n, nm in pairs if query in nm.lower())
+                module_path = str(path)
+                for n, nm in itertools.islice(pairs, limit):
                     results.append(
                         {
                             "name": nm,
                             "type": getattr(n, "type", None),
                             "line": getattr(n, "line", None),
                             "column": getattr(n, "column", None),
-                            "module_path": str(path),
+                            "module_path": module_path,
                         }
                     )
-                    if len(results) >= limit:
-                        break
-
-
 
             elif action == "diagnostics":
                 diags = []
+                code = read_text(path)
                 # Syntax diagnostics (fast path)
                 try:
                     compile(code, str(path), "exec")
@@ -126,24 +141,17 @@ class LspTool:
                         "column": getattr(se, "offset", None),
                     })
 
-                # Bytecode compilation (best-effort)
+                # Bytecode compilation (best-effort), in-process: no interpreter spawn per call.
                 try:
-                    import subprocess, sys
-                    cp = subprocess.run(
-                        [sys.executable, "-m", "py_compile", str(path)],
-                        capture_output=True,
-                        text=True,
-                        cwd=str(cwd),
-                        timeout=20,
-                    )
-                    if cp.returncode != 0:
-                        msg = (cp.stderr or cp.stdout or "").strip()
-                        if msg:
-                            diags.append({
-                                "severity": "error",
-                                "source": "py_compile",
-                                "message": msg[:4000],
-                            })
+                    py_compile.compile(str(path), doraise=True)
+                except py_compile.PyCompileError as pe:
+                    msg = (pe.msg or "").strip()
+                    if msg:
+                        diags.append({
+                            "severity": "error",
+                            "source": "py_compile",
+                            "message": msg[:4000],
+                        })
                 except Exception as e:
                     diags.append({
                         "severity": "warning",
@@ -10,6 +10,28 @@ import shutil
 from ..base import ToolSpec, ToolResult, ToolContext
 from ...util.subprocess import run_cmd
 
+
+def _memfd_patch(diff_text: str) -> tuple[int, str] | None:
+    """Stage the diff in an anonymous in-memory file (Linux memfd); returns (fd, path) or None.
+
+    The path goes through /proc/<our pid>/fd so the git/patch child can open it without
+    inheriting the descriptor.
+    """
+    if not hasattr(os, "memfd_create") or not os.path.isdir("/proc/self/fd"):
+        return None
+    try:
+        fd = os.memfd_create("pyopencode-patch", getattr(os, "MFD_CLOEXEC", 0))
+    except OSError:
+        return None
+    try:
+        data = memoryview(diff_text.encode("utf-8"))
+        while data:
+            data = data[os.write(fd, data):]
+    except OSError:
+        os.close(fd)
+        return None
+    return fd, f"/proc/{os.getpid()}/fd/{fd}"
+
 @dataclass
 class PatchTool:
     spec: ToolSpec = ToolSpec(
@@ -28,9 +50,14 @@ class PatchTool:
     def execute(self, ctx: ToolContext, args: dict[str, Any]) -> ToolResult:
         diff_text = args["diff"]
         cwd = ctx.cwd
-        with tempfile.NamedTemporaryFile("w", delete=False, suffix=".patch", encoding="utf-8") as f:
-            f.write(diff_text)
-            patch_path = f.name
+        memfd = _memfd_patch(diff_text)
+        if memfd is not None:
+            patch_fd, patch_path = memfd
+        else:
+            patch_fd = None
+            with tempfile.NamedTemporaryFile("w", delete=False, suffix=".patch", encoding="utf-8") as f:
+                f.write(diff_text)
+                patch_path = f.name
 
         try:
             # prefer git apply if git exists
@@ -49,6 +76,9 @@ class PatchTool:
             return ToolResult("No patch tool available (need git or patch).", is_error=True)
         finally:
             try:
-                os.unlink(patch_path)
+                if patch_fd is not None:
+                    os.close(patch_fd)
+                else:
+                    os.unlink(patch_path)
             except Exception:
                 pass
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Any
 
 from ..base import ToolContext, ToolResult, ToolSpec
+from ...util.fs import read_text
 
 
 class SkillTool:
@@ -34,7 +35,7 @@ class SkillTool:
                 return ToolResult(content=f"Skill path escapes cwd: {p}", is_error=True)
             if not p.exists() or not p.is_file():
                 return ToolResult(content=f"Skill file not found: {p}", is_error=True)
-            text = p.read_text(encoding="utf-8", errors="replace")
+            text = read_text(p)
         except Exception as e:
             return ToolResult(content=f"skill failed: {e}", is_error=True)
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import threading
 import time
 import uuid
 from dataclasses import dataclass
@@ -10,6 +13,7 @@ from typing import Any, Literal
 from platformdirs import user_data_dir
 
 from ..base import ToolContext, ToolResult, ToolSpec
+from ...util.fs import write_bytes
 
 
 Status = Literal["todo", "doing", "done"]
@@ -20,8 +24,9 @@ class TodoItem:
     id: str
     text: str
     status: Status = "todo"
-    created_at: float = 0.0
-    updated_at: float = 0.0
+    # time.time_ns() values
+    created_at: int = 0
+    updated_at: int = 0
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -38,43 +43,160 @@ class TodoItem:
             id=str(d.get("id") or ""),
             text=str(d.get("text") or ""),
             status=d.get("status") or "todo",
-            created_at=float(d.get("created_at") or 0.0),
-            updated_at=float(d.get("updated_at") or 0.0),
+            created_at=_as_ns(d.get("created_at")),
+            updated_at=_as_ns(d.get("updated_at")),
         )
 
 
+def _as_ns(v: Any) -> int:
+    # Older files stored float seconds (time.time()); current ones store int nanoseconds.
+    if isinstance(v, float):
+        return int(v * 1_000_000_000)
+    try:
+        return int(v or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+_ROOT: Path | None = None
+
+
 def _todo_path(session_id: str | None) -> Path:
-    root = Path(user_data_dir("pyopencode")) / "todos"
-    root.mkdir(parents=True, exist_ok=True)
+    global _ROOT
+    if _ROOT is None:
+        # Resolve + mkdir once per process instead of on every todo read/write.
+        root = Path(user_data_dir("pyopencode")) / "todos"
+        root.mkdir(parents=True, exist_ok=True)
+        _ROOT = root
     sid = session_id or "default"
-    return root / f"{sid}.json"
+    return _ROOT / f"{sid}.json"
 
 
-def _load(session_id: str | None) -> list[TodoItem]:
-    p = _todo_path(session_id)
-    if not p.exists():
-        return []
+# Cache of parsed todo lists (id -> item, in list order), keyed by file path. The
+# (mtime_ns, size) stamp taken after our own write detects edits by other processes.
+_CACHE: dict[str, dict[str, TodoItem]] = {}
+_STAMP: dict[str, tuple[int, int]] = {}
+
+# Saves are batched: _save() updates the cache and marks the path dirty. The first save after
+# a quiet period is written at once; later ones are written once _FLUSH_EVERY saves have
+# accumulated, by a timer _FLUSH_INTERVAL_S seconds after the burst started, and at exit.
+_FLUSH_EVERY = 8
+_FLUSH_INTERVAL_S = 2.0
+_DIRTY: set[str] = set()
+_dirty_saves = 0
+_last_flush = 0.0
+_timer: threading.Timer | None = None
+# Guards the cache/dirty state shared with the flush timer thread.
+_LOCK = threading.RLock()
+
+
+def _stamp(p: Path) -> tuple[int, int] | None:
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
-        if not isinstance(data, list):
-            return []
-        return [TodoItem.from_dict(x) for x in data if isinstance(x, dict)]
-    except Exception:
-        return []
+        st = os.stat(p)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
 
 
-def _save(session_id: str | None, items: list[TodoItem]) -> None:
+def _load(session_id: str | None) -> dict[str, TodoItem]:
+    """Todo items by id, in list order (dicts keep insertion order)."""
     p = _todo_path(session_id)
-    p.write_text(json.dumps([i.to_dict() for i in items], ensure_ascii=False, indent=2), encoding="utf-8")
+    key = str(p)
+    with _LOCK:
+        stamp = _stamp(p)
+        if key in _DIRTY:
+            if stamp == _STAMP.get(key):
+                # Unflushed saves: the cache is newer than the file.
+                return dict(_CACHE[key])
+            # Another process rewrote the file since our last flush: its version wins over
+            # our unflushed saves instead of being overwritten by the next flush.
+            _DIRTY.discard(key)
+        if stamp is None:
+            _CACHE.pop(key, None)
+            _STAMP.pop(key, None)
+            return {}
+        if _STAMP.get(key) == stamp:
+            # Callers may add/delete; hand out a copy of the mapping.
+            return dict(_CACHE[key])
+        try:
+            # json.loads accepts bytes directly (encoding is detected), so skip the text layer.
+            data = json.loads(p.read_bytes())
+            if not isinstance(data, list):
+                return {}
+            items: dict[str, TodoItem] = {}
+            for x in data:
+                if isinstance(x, dict):
+                    it = TodoItem.from_dict(x)
+                    items[it.id] = it
+        except Exception:
+            return {}
+        _CACHE[key] = items
+        _STAMP[key] = stamp
+        return dict(items)
+
 
+def _write(key: str) -> None:
+    p = Path(key)
+    # Stored as a JSON list (same format as before); compact separators: no indentation or
+    # whitespace to generate or parse back on every mutation.
+    data = json.dumps([i.to_dict() for i in _CACHE[key].values()], ensure_ascii=False, separators=(",", ":"))
+    # Write a sibling temp file and rename over the target: readers never see a partial file.
+    tmp = p.with_name(p.name + ".tmp")
+    write_bytes(tmp, data.encode("utf-8"))
+    os.replace(tmp, p)
+    stamp = _stamp(p)
+    if stamp is None:
+        _STAMP.pop(key, None)
+    else:
+        _STAMP[key] = stamp
 
-def _format(items: list[TodoItem]) -> str:
+
+def flush_todos() -> None:
+    """Write every todo list with unflushed saves (best-effort)."""
+    global _dirty_saves, _last_flush, _timer
+    with _LOCK:
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+        for key in list(_DIRTY):
+            try:
+                _write(key)
+            except Exception:
+                continue
+            _DIRTY.discard(key)
+        _dirty_saves = 0
+        _last_flush = time.monotonic()
+
+
+atexit.register(flush_todos)
+
+
+def _save(session_id: str | None, items: dict[str, TodoItem]) -> None:
+    global _dirty_saves, _timer
+    key = str(_todo_path(session_id))
+    with _LOCK:
+        _CACHE[key] = dict(items)
+        _DIRTY.add(key)
+        _dirty_saves += 1
+        if _dirty_saves >= _FLUSH_EVERY or time.monotonic() - _last_flush >= _FLUSH_INTERVAL_S:
+            flush_todos()
+        elif _timer is None:
+            # Saves later in the burst reach disk without waiting for another save or exit.
+            _timer = threading.Timer(_FLUSH_INTERVAL_S, flush_todos)
+            _timer.daemon = True
+            _timer.start()
+
+
+_PREFIX: dict[str, str] = {s: f"- [{s}] " for s in ("todo", "doing", "done")}
+
+
+def _format(items: dict[str, TodoItem]) -> str:
     if not items:
         return "(empty todo list)"
-    lines = []
-    for it in items:
-        lines.append(f"- [{it.status}] {it.id}: {it.text}")
-    return "\n".join(lines)
+    # Statuses read from disk are not validated, hence the fallback.
+    return "\n".join(
+        (_PREFIX.get(it.status) or f"- [{it.status}] ") + it.id + ": " + it.text for it in items.values()
+    )
 
 
 class TodoReadTool:
@@ -121,10 +243,10 @@ class TodoWriteTool:
     def execute(self, ctx: ToolContext, args: dict[str, Any]) -> ToolResult:
         action = str(args.get("action") or "").strip().lower()
         items = _load(ctx.session_id)
-        now = time.time()
+        now = time.time_ns()
 
         if action == "clear":
-            items = []
+            items = {}
             _save(ctx.session_id, items)
             return ToolResult(content="Cleared todo list.\n" + _format(items))
 
@@ -133,7 +255,7 @@ class TodoWriteTool:
             if not text:
                 return ToolResult(content="todowrite add requires: text", is_error=True)
             it = TodoItem(id=uuid.uuid4().hex[:8], text=text, status="todo", created_at=now, updated_at=now)
-            items.append(it)
+            items[it.id] = it
             _save(ctx.session_id, items)
             return ToolResult(content="Added todo.\n" + _format(items))
 
@@ -141,27 +263,27 @@ class TodoWriteTool:
             tid = str(args.get("id") or "").strip()
             if not tid:
                 return ToolResult(content=f"todowrite {action} requires: id", is_error=True)
-            idx = next((i for i, x in enumerate(items) if x.id == tid), None)
-            if idx is None:
+            item = items.get(tid)
+            if item is None:
                 return ToolResult(content=f"Todo id not found: {tid}", is_error=True)
 
             if action == "remove":
-                removed = items.pop(idx)
+                del items[tid]
                 _save(ctx.session_id, items)
-                return ToolResult(content=f"Removed todo {removed.id}.\n" + _format(items))
+                return ToolResult(content=f"Removed todo {item.id}.\n" + _format(items))
 
-            # update
+            # update (validate first: items are shared with the cache, so never half-apply)
             text = args.get("text")
             status = args.get("status")
+            st = str(status) if status is not None else None
+            if st is not None and st not in {"todo", "doing", "done"}:
+                return ToolResult(content=f"Invalid status: {st}", is_error=True)
             if text is not None:
-                items[idx].text = str(text)
-            if status is not None:
-                st = str(status)
-                if st not in {"todo", "doing", "done"}:
-                    return ToolResult(content=f"Invalid status: {st}", is_error=True)
-                items[idx].status = st  # type: ignore
-            items[idx].updated_at = now
+                item.text = str(text)
+            if st is not None:
+                item.status = st  # type: ignore
+            item.updated_at = now
             _save(ctx.session_id, items)
-            return ToolResult(content=f"Updated todo {items[idx].id}.\n" + _format(items))
+            return ToolResult(content=f"Updated todo {item.id}.\n" + _format(items))
 
         return ToolResult(content=f"Invalid action: {action}", is_error=True)
@@ -1,25 +1,272 @@
 from __future__ import annotations
 
+import codecs
+import http.client
+import queue
 import re
+import threading
+import urllib.error
+import urllib.parse
 import urllib.request
+import zlib
+from contextlib import closing
 from html.parser import HTMLParser
-from typing import Any
+from typing import Any, Iterator
 
 from ..base import ToolContext, ToolResult, ToolSpec
 
+_BLANK_RE = re.compile(r"\n{3,}")
+_SKIP_TAGS = frozenset({"script", "style", "noscript"})
+_READ_CHUNK = 64 * 1024
+# Raw HTML is mostly markup, so it gets a larger byte budget than max_chars * 4.
+_MIN_HTML_BYTES = 2 * 1024 * 1024
+_GZIP_ENCODINGS = frozenset({"gzip", "x-gzip"})
+# Decompressed chunks buffered between the reader thread and the parser.
+_PIPE_DEPTH = 2
+_PIPE_DONE = object()
+
+
+# Keep-alive connections, at most one idle per (scheme, netloc), so repeated fetches from the
+# same host skip the TCP/TLS handshake. A connection is checked out while in use.
+_POOL: dict[tuple[str, str], http.client.HTTPConnection] = {}
+_POOL_LOCK = threading.Lock()
+_POOL_MAX = 16
+_REDIRECTS = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 10  # same limit as urllib's HTTPRedirectHandler
+
+
+class _EnoughText(Exception):
+    """Raised from the parser once enough text has been collected."""
+
+
+class _PooledResponse:
+    """A pooled http.client response; the connection is reused only if the body was drained."""
+
+    def __init__(self, key: tuple[str, str], conn: http.client.HTTPConnection, resp: http.client.HTTPResponse):
+        self._key = key
+        self._conn = conn
+        self._resp = resp
+        self.headers = resp.headers
+
+    def read(self, n: int = -1) -> bytes:
+        return self._resp.read(n)
+
+    def __enter__(self) -> "_PooledResponse":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _release(self._key, self._conn, self._resp)
+
+
+def _release(key: tuple[str, str], conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+    if resp.isclosed() and not resp.will_close:
+        with _POOL_LOCK:
+            old = _POOL.pop(key, None)
+            if len(_POOL) < _POOL_MAX:
+                _POOL[key] = conn
+                conn = None  # type: ignore[assignment]
+        if old is not None:
+            old.close()
+    if conn is not None:
+        conn.close()
+
+
+def _new_conn(key: tuple[str, str], timeout: int) -> http.client.HTTPConnection:
+    cls = http.client.HTTPSConnection if key[0] == "https" else http.client.HTTPConnection
+    return cls(key[1], timeout=timeout)
+
+
+def _use_urllib(parts: urllib.parse.SplitResult) -> bool:
+    # Leave anything the pool does not handle (other schemes, credentials, proxies) to urlopen.
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or "@" in parts.netloc:
+        return True
+    return bool(urllib.request.getproxies().get(scheme)) and not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def _open(url: str, headers: dict[str, str], timeout: int) -> Any:
+    """GET `url` following redirects, like urllib.request.urlopen but over pooled connections.
+
+    Non-2xx responses raise urllib.error.HTTPError, as urlopen does.
+    """
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if _use_urllib(parts):
+            return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout)
+        key = (parts.scheme.lower(), parts.netloc)
+        target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        with _POOL_LOCK:
+            conn = _POOL.pop(key, None)
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        else:
+            conn = _new_conn(key, timeout)
+        try:
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+            except (ConnectionError, http.client.BadStatusLine):
+                # An idle keep-alive connection may have been closed by the server: retry fresh.
+                conn.close()
+                conn = _new_conn(key, timeout)
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+        except OSError as e:
+            conn.close()
+            # Same error shape as urlopen ("<urlopen error ...>").
+            raise urllib.error.URLError(e) from e
+        except BaseException:
+            conn.close()
+            raise
+        location = resp.getheader("Location")
+        if resp.status in _REDIRECTS and location:
+            resp.read()
+            _release(key, conn, resp)
+            new_url = urllib.parse.urljoin(url, location)
+            # Like urllib's HTTPRedirectHandler: never let a server redirect us to file:, ftp:, etc.
+            if urllib.parse.urlsplit(new_url).scheme.lower() not in ("http", "https"):
+                raise urllib.error.HTTPError(
+                    new_url,
+                    resp.status,
+                    f"{resp.reason} - Redirection to url '{new_url}' is not allowed",
+                    resp.headers,
+                    None,
+                )
+            url = new_url
+            continue
+        if not 200 <= resp.status < 300:
+            conn.close()
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return _PooledResponse(key, conn, resp)
+    raise urllib.error.HTTPError(
+        url,
+        resp.status,
+        "The HTTP server returned a redirect error that would lead to an infinite loop.\n"
+        "The last 30x error message was:\n" + resp.reason,
+        resp.headers,
+        None,
+    )
+
+
+def _decode(raw: bytes | bytearray, charset: str | None, final: bool) -> str:
+    """Decode once: the declared charset (lenient), else UTF-8 with a latin-1 fallback.
+
+    With final=False a multi-byte sequence cut off at the end of `raw` is dropped
+    instead of being treated as an error.
+    """
+    if charset:
+        try:
+            return codecs.getincrementaldecoder(charset)(errors="replace").decode(raw, final)
+        except LookupError:
+            pass
+    try:
+        return codecs.getincrementaldecoder("utf-8")().decode(raw, final)
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+class _Body:
+    """Iterate a response body in chunks, gunzipped when `gz`, stopping after `budget` bytes.
+
+    After iteration, `cut` tells whether the body continued past the budget.
+    """
+
+    def __init__(self, resp: Any, budget: int, gz: bool):
+        self._resp = resp
+        self._budget = budget
+        self._gz = gz
+        self.cut = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._gunzip() if self._gz else self._plain()
+
+    def _plain(self) -> Iterator[bytes]:
+        left = self._budget
+        while left > 0:
+            chunk = self._resp.read(min(_READ_CHUNK, left))
+            if not chunk:
+                return
+            left -= len(chunk)
+            yield chunk
+        self.cut = bool(self._resp.read(1))
+
+    def _gunzip(self) -> Iterator[bytes]:
+        d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        left = self._budget
+        while left > 0 and not d.eof:
+            raw = d.unconsumed_tail or self._resp.read(_READ_CHUNK)
+            if not raw:
+                return
+            # max_length bounds the output: a small compressed body cannot expand past the budget.
+            out = d.decompress(raw, min(left, _READ_CHUNK))
+            if out:
+                left -= len(out)
+                yield out
+        if not d.eof:
+            raw = d.unconsumed_tail or self._resp.read(_READ_CHUNK)
+            self.cut = bool(raw) and bool(d.decompress(raw, 1))
+
+
+def _pipelined(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Produce `chunks` on a worker thread through a small bounded queue.
+
+    Reading + decompressing (both release the GIL) overlaps with the consumer's parsing.
+    Closing the returned generator stops the worker.
+    """
+    q: queue.Queue[Any] = queue.Queue(maxsize=_PIPE_DEPTH)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(_PIPE_DONE)
+        except BaseException as e:  # handed to the consumer
+            put(e)
+
+    worker = threading.Thread(target=produce, name="webfetch-read", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _PIPE_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
 
 class _HTMLTextExtractor(HTMLParser):
-    def __init__(self) -> None:
+    def __init__(self, limit: int | None = None) -> None:
         super().__init__()
         self._parts: list[str] = []
         self._skip_depth = 0
+        # Stop (raise _EnoughText) once more than `limit` chars of text were collected.
+        self._limit = limit
+        self._chars = 0
 
+    # HTMLParser already hands us lowercased tag names.
     def handle_starttag(self, tag: str, attrs):  # type: ignore[override]
-        if tag.lower() in {"script", "style", "noscript"}:
+        if tag in _SKIP_TAGS:
             self._skip_depth += 1
 
     def handle_endtag(self, tag: str):  # type: ignore[override]
-        if tag.lower() in {"script", "style", "noscript"} and self._skip_depth > 0:
+        if self._skip_depth > 0 and tag in _SKIP_TAGS:
             self._skip_depth -= 1
 
     def handle_data(self, data: str):  # type: ignore[override]
@@ -28,11 +275,15 @@ class _HTMLTextExtractor(HTMLParser):
         text = data.strip()
         if text:
             self._parts.append(text)
+            self._chars += len(text)
+            if self._limit is not None and self._chars > self._limit:
+                raise _EnoughText
 
     def text(self) -> str:
         joined = "\n".join(self._parts)
-        # collapse excessive blank lines
-        joined = re.sub(r"\n{3,}", "\n\n", joined)
+        # collapse excessive blank lines (parts are stripped, so runs only come from inside one)
+        if "\n\n\n" in joined:
+            joined = _BLANK_RE.sub("\n\n", joined)
         return joined.strip()
 
 
@@ -76,35 +327,87 @@ class WebFetchTool:
         if not isinstance(headers, dict):
             headers = {}
 
-        req = urllib.request.Request(url, headers={"User-Agent": "pyopencode/0.1", **headers})
+        req_headers = {"User-Agent": "pyopencode/0.1", **headers}
+        if not any(k.lower() == "accept-encoding" for k in req_headers):
+            req_headers["Accept-Encoding"] = "gzip"
+
+        text: str | None = None
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                raw = resp.read()
-                content_type = (resp.headers.get("Content-Type") or "").lower()
+            with _open(url, req_headers, timeout) as resp:
+                # Bare MIME type, already lowercased (parameters such as charset stripped).
+                content_type = resp.headers.get_content_type()
+                charset = resp.headers.get_content_charset()
+                gz = (resp.headers.get("Content-Encoding") or "").strip().lower() in _GZIP_ENCODINGS
+                # Read only as much as can end up in the result (a char is at most 4 bytes).
+                budget = max_chars * 4
+                if "html" in content_type:
+                    budget = max(budget, _MIN_HTML_BYTES)
+                body = _Body(resp, budget, gz)
+                # Declared HTML is parsed while the body streams in (see below).
+                parser = _HTMLTextExtractor(limit=max_chars) if "html" in content_type else None
+                dec = None
+                if parser is not None:
+                    try:
+                        dec = codecs.getincrementaldecoder(charset or "utf-8")(
+                            errors="replace" if charset else "strict"
+                        )
+                    except LookupError:
+                        dec = codecs.getincrementaldecoder("utf-8")()
+                pending = ""
+                buf = bytearray()
+                with closing(_pipelined(iter(body)) if gz else iter(body)) as chunks:
+                    for chunk in chunks:
+                        buf += chunk
+                        if parser is None or dec is None:
+                            continue
+                        try:
+                            s = pending + dec.decode(chunk)
+                            # Feed up to the last "<" so no text run is split across feeds
+                            # (each handle_data call becomes one output line).
+                            k = s.rfind("<")
+                            if k > 0:
+                                parser.feed(s[:k])
+                                s = s[k:]
+                            pending = s
+                        except _EnoughText:
+                            text = parser.text()
+                            break
+                        except Exception:
+                            # Undecodable without a charset, or a parser error: redo it below.
+                            parser = None
+                cut = body.cut or text is not None
+                if parser is not None and dec is not None and text is None:
+                    try:
+                        parser.feed(pending + dec.decode(b"", final=not cut))
+                        text = parser.text()
+                    except _EnoughText:
+                        text = parser.text()
+                        cut = True
+                    except Exception:
+                        pass
         except Exception as e:
             return ToolResult(content=f"webfetch failed: {e}", is_error=True)
 
-        # Best-effort decode
-        text = None
-        for enc in ("utf-8", "utf-8-sig", "latin-1"):
-            try:
-                text = raw.decode(enc)
-                break
-            except Exception:
-                continue
         if text is None:
-            return ToolResult(content="webfetch failed: could not decode response body", is_error=True)
+            text = _decode(buf, charset, final=not cut)
 
-        if "html" in content_type or "<html" in text.lower():
-            parser = _HTMLTextExtractor()
-            try:
-                parser.feed(text)
-                text = parser.text()
-            except Exception:
-                # fall back to raw
-                pass
+            # Sniff only the start of the body rather than lowercasing a copy of all of it.
+            if "html" in content_type or b"<html" in buf[:1024].lower():
+                parser = _HTMLTextExtractor(limit=max_chars)
+                try:
+                    parser.feed(text)
+                    text = parser.text()
+                except _EnoughText:
+                    text = parser.text()
+                    cut = True
+                except Exception:
+                    # fall back to raw
+                    pass
 
-        if len(text) > max_chars:
+        if cut:
+            # Only a prefix was read, so there is no real tail to show: keep the head only.
+            text = text[:max_chars] + "\n\n... (truncated) ..."
+        elif len(text) > max_chars:
             head = text[: max_chars // 2]
             tail = text[-max_chars // 2 :]
             text = head + "\n\n... (truncated) ...\n\n" + tail
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
-from fnmatch import fnmatch
-from typing import Any, Literal
+from fnmatch import translate
+from typing import Any, Literal, NamedTuple
 
 from rich.console import Console
 
 Decision = Literal["allow", "ask", "deny"]
 
+# Compiled rules store decisions as small ints; _DEC_S maps them back to the (interned) strings.
+_DEC: dict[str, int] = {"allow": 0, "deny": 1, "ask": 2}
+_DEC_S: tuple[Decision, ...] = ("allow", "deny", "ask")
+
 console = Console()
 
 
@@ -22,6 +27,14 @@ class PermissionRule:
 
     match: str
     decision: Decision
+    # Compiled once at construction: the fnmatch pattern (without any "tool:" prefix).
+    _regex: re.Pattern[str] = field(init=False, repr=False, compare=False)
+    _tool_only: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._tool_only = self.match.startswith("tool:")
+        pat = self.match[len("tool:") :] if self._tool_only else self.match
+        self._regex = re.compile(translate(pat))
 
     @staticmethod
     def from_obj(obj: Any) -> "PermissionRule | None":
@@ -34,7 +47,11 @@ class PermissionRule:
         return PermissionRule(match=m, decision=d)
 
 
-@dataclass
+# Default keys stored as attributes on PermissionConfig; any other key lives in `extras`.
+_BUILTIN_KEYS = frozenset({"read", "edit", "bash", "mcp"})
+
+
+@dataclass(slots=True)
 class PermissionConfig:
     """Phase 2 permission config.
 
@@ -42,42 +59,131 @@ class PermissionConfig:
     arbitrary tool keys and rule-based matching.
     """
 
-    defaults: dict[str, Decision] = field(default_factory=lambda: {"read": "allow", "edit": "ask", "bash": "ask", "mcp": "ask",})
+    read: Decision = "allow"
+    edit: Decision = "ask"
+    bash: Decision = "ask"
+    mcp: Decision = "ask"
+    extras: dict[str, Decision] = field(default_factory=dict)
     rules: list[PermissionRule] = field(default_factory=list)
+    # Immutable snapshot of the rules (see _compile_rules); rebuilt lazily after rule changes.
+    _compiled: "_CompiledRules | None" = field(default=None, init=False, repr=False, compare=False)
+    # decide() results per (permission_key, tool_name); cleared whenever defaults/rules change.
+    _cache: dict[tuple[str, str], Decision] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     @staticmethod
     def default_extended() -> "PermissionConfig":
         return PermissionConfig()
 
+    @property
+    def defaults(self) -> dict[str, Decision]:
+        """All default decisions as a (read-only snapshot) dict."""
+        return {"read": self.read, "edit": self.edit, "bash": self.bash, "mcp": self.mcp, **self.extras}
+
+    def _default(self, key: str) -> Decision | None:
+        if key in _BUILTIN_KEYS:
+            return getattr(self, key)
+        return self.extras.get(key)
+
+    def _set_default(self, key: str, decision: Decision) -> None:
+        if key in _BUILTIN_KEYS:
+            setattr(self, key, decision)
+        else:
+            self.extras[key] = decision
+
     def set(self, key: str, decision: Decision) -> None:
-        self.defaults[key] = decision
+        self._set_default(key, decision)
+        self._cache.clear()
 
     def apply_behavior(self, rules: list[PermissionRule]) -> None:
         # behavior rules appended after defaults; later rules win.
         self.rules.extend(rules)
+        self._compiled = None
+        self._cache.clear()
 
     def apply_agent_overrides(self, overrides: dict[str, Decision]) -> None:
         for k, v in overrides.items():
-            self.defaults[k] = v
+            self._set_default(k, v)
+        self._cache.clear()
+
+    def _compile_rules(self) -> "_CompiledRules":
+        """Fold the rules into two alternations, one group per rule (r<index>).
+
+        (Not "g": fnmatch.translate() on 3.10 emits its own g<n> groups.)
+
+        Alternatives are emitted last rule first, so the group a fullmatch() picks is the
+        highest-indexed (i.e. winning) rule of that kind.
+        """
+        rules = tuple(self.rules)
+        tool_alts: list[str] = []
+        generic_alts: list[str] = []
+        seen: set[tuple[bool, str]] = set()
+        for i in range(len(rules) - 1, -1, -1):
+            rule = rules[i]
+            # An earlier rule with the same pattern can never win; skipping it also keeps
+            # group names unique (3.10's translate() output carries named groups).
+            k = (rule._tool_only, rule._regex.pattern)
+            if k in seen:
+                continue
+            seen.add(k)
+            alt = f"(?P<r{i}>{rule._regex.pattern})"
+            (tool_alts if rule._tool_only else generic_alts).append(alt)
+        return _CompiledRules(
+            *_compile_alternation(tool_alts),
+            *_compile_alternation(generic_alts),
+            bytes(_DEC[r.decision] for r in rules),
+        )
 
     def _match_rules(self, permission_key: str, tool_name: str) -> Decision | None:
-        decision: Decision | None = None
-        for rule in self.rules:
-            m = rule.match
-            if m.startswith("tool:"):
-                pat = m[len("tool:") :]
-                if fnmatch(tool_name, pat):
-                    decision = rule.decision
-            else:
-                if fnmatch(permission_key, m) or fnmatch(tool_name, m):
-                    decision = rule.decision
-        return decision
+        c = self._compiled
+        if c is None:
+            c = self._compiled = self._compile_rules()
+        best = -1
+        for rx, rule_of, s in (
+            (c.tool_re, c.tool_rule_of, tool_name),
+            (c.generic_re, c.generic_rule_of, permission_key),
+            (c.generic_re, c.generic_rule_of, tool_name),
+        ):
+            if rx is None:
+                continue
+            m = rx.fullmatch(s)
+            if m is not None:
+                # The rule's own group closes last, so lastindex names it.
+                i = rule_of[m.lastindex]  # type: ignore[index]
+                if i > best:
+                    best = i
+        return _DEC_S[c.rule_dec[best]] if best >= 0 else None
 
     def decide(self, permission_key: str, tool_name: str) -> Decision:
+        key = (permission_key, tool_name)
+        v = self._cache.get(key)
+        if v is not None:
+            return v
         r = self._match_rules(permission_key, tool_name)
-        if r is not None:
-            return r
-        return self.defaults.get(permission_key, self.defaults.get(tool_name, "ask"))
+        if r is None:
+            r = self._default(permission_key) or self._default(tool_name) or "ask"
+        self._cache[key] = r
+        return r
+
+
+class _CompiledRules(NamedTuple):
+    tool_re: re.Pattern[str] | None
+    # group number -> rule index (-1 for groups fnmatch.translate() adds itself)
+    tool_rule_of: tuple[int, ...]
+    generic_re: re.Pattern[str] | None
+    generic_rule_of: tuple[int, ...]
+    # decision code per rule index (see _DEC / _DEC_S)
+    rule_dec: bytes
+
+
+def _compile_alternation(alts: list[str]) -> tuple[re.Pattern[str] | None, tuple[int, ...]]:
+    if not alts:
+        return None, ()
+    rx = re.compile("|".join(alts))
+    rule_of = [-1] * (rx.groups + 1)
+    for name, num in rx.groupindex.items():
+        if name[0] == "r":
+            rule_of[num] = int(name[1:])
+    return rx, tuple(rule_of)
 
 
 class PermissionGate:
@@ -1,21 +1,68 @@
 from __future__ import annotations
+import os
+from functools import lru_cache
 from pathlib import Path
 
+# Upper bound for a single os.write() call on large contents.
+_WRITE_CHUNK_BYTES = 1024 * 1024
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
 class FsError(RuntimeError):
     pass
 
+@lru_cache(maxsize=32)
+def _resolved_cwd(cwd: str) -> tuple[Path, str]:
+    """Resolved cwd plus its normcased string form, computed once per cwd (realpath is a
+    syscall per path component)."""
+    base = Path(cwd).resolve()
+    return base, os.path.normcase(str(base))
+
 def resolve_path(cwd: Path, path_str: str) -> Path:
+    base, base_key = _resolved_cwd(os.fspath(cwd))
     p = Path(path_str)
     if not p.is_absolute():
-        p = (cwd / p).resolve()
-    else:
-        p = p.resolve()
+        p = base / p
+    p = p.resolve()
     # Ensure within cwd to avoid escapes? For local agent, safer default.
-    try:
-        p.relative_to(cwd.resolve())
-    except Exception:
+    if not _is_under(base_key, os.path.normcase(str(p))):
         raise FsError(f"Path escapes working directory: {path_str}")
     return p
 
+def _is_under(base_key: str, key: str) -> bool:
+    return key == base_key or key.startswith(base_key.rstrip(os.sep) + os.sep)
+
+def is_within_cwd(cwd: str | Path, path: str) -> bool:
+    """True when `path` (absolute, symlinks resolved) is `cwd` or lies under it."""
+    _, base_key = _resolved_cwd(os.fspath(cwd))
+    return _is_under(base_key, os.path.normcase(os.path.realpath(path)))
+
 def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="replace")
+    # One read + one decode, bypassing TextIOWrapper's incremental decoder. Newlines are
+    # still normalized to "\n" (as text mode did), but only when the file has any "\r".
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def split_lines(text: str) -> list[str]:
+    r"""Split text on "\n" only; a trailing newline does not add an empty last line.
+
+    read, grep and edit all number lines this way (as do the mmap paths, which count b"\n").
+    str.splitlines() would also break on \x0c, \x85, \u2028, ... and shift line numbers.
+    """
+    lines = text.split("\n")
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+def write_bytes(path: Path, data: bytes) -> None:
+    """Create/truncate `path` and write `data` through a raw fd (no buffered/text IO layers)."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        mv = memoryview(data)
+        written = 0
+        while written < len(mv):
+            written += os.write(fd, mv[written:written + _WRITE_CHUNK_BYTES])
+    finally:
+        os.close(fd)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Always pruned, with or without a .gitignore.
+DEFAULT_IGNORE = (".git/", "__pycache__/", "*.pyc")
+
+
+def _translate(pat: str) -> str:
+    """Translate a gitignore glob (no leading '/', no trailing '/') into a regex body."""
+    out: list[str] = []
+    i, n = 0, len(pat)
+    while i < n:
+        c = pat[i]
+        if c == "*":
+            if pat.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pat.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pat.find("]", i + 2)
+            if j < 0:
+                out.append(re.escape(c))
+            else:
+                body = pat[i + 1:j]
+                if body[:1] == "!":
+                    body = "^" + body[1:]
+                out.append("[" + body + "]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pat[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class _Rule:
+    rx: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+class IgnoreSpec:
+    """Minimal gitignore matcher (stdlib only).
+
+    Supports comments, `!` negation, trailing `/` (directories only), anchored patterns
+    (containing a `/`) and `*`, `?`, `[...]`, `**`. Paths are '/'-separated and relative
+    to the directory holding the .gitignore; the last matching rule wins.
+    """
+
+    def __init__(self, lines: list[str] | tuple[str, ...]):
+        self.rules: list[_Rule] = []
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip("\r")
+            if not line.strip() or line.startswith("#"):
+                continue
+            if not line.endswith("\\ "):
+                line = line.rstrip(" ")
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\#") or line.startswith("\\!"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            if "/" in line:
+                body = _translate(line.lstrip("/"))
+            else:
+                body = "(?:.*/)?" + _translate(line)
+            self.rules.append(_Rule(re.compile(body + r"\Z", re.DOTALL), negate, dir_only))
+
+    def match(self, rel: str, is_dir: bool = False) -> bool:
+        """True when `rel` itself is ignored (parents are not checked)."""
+        ignored = False
+        for r in self.rules:
+            if r.dir_only and not is_dir:
+                continue
+            if r.negate == ignored and r.rx.match(rel):
+                ignored = not r.negate
+        return ignored
+
+    def is_ignored(
+        self,
+        rel: str,
+        is_dir: bool = False,
+        dir_cache: dict[str, bool] | None = None,
+        base: str = "",
+    ) -> bool:
+        """Like match(), but a path under an ignored directory is ignored too.
+
+        `base` is a directory the caller asked for explicitly (e.g. a glob's literal leading
+        directory); it and its parents are not checked, as in a walk started there.
+        `dir_cache` memoizes parent-directory verdicts across calls with the same `base`.
+        """
+        if len(rel) <= len(base):
+            return False
+        cache = dir_cache if dir_cache is not None else {}
+        parent = rel.rpartition("/")[0]
+        if len(parent) > len(base):
+            hit = cache.get(parent)
+            if hit is None:
+                hit = cache[parent] = self.is_ignored(parent, True, cache, base)
+            if hit:
+                return True
+        return self.match(rel, is_dir)
+
+
+@lru_cache(maxsize=16)
+def _load(gitignore: str, mtime_ns: int) -> IgnoreSpec:
+    lines: list[str] = list(DEFAULT_IGNORE)
+    if mtime_ns >= 0:
+        try:
+            with open(gitignore, encoding="utf-8", errors="replace") as f:
+                lines.extend(f.read().splitlines())
+        except OSError:
+            pass
+    return IgnoreSpec(lines)
+
+
+def load_ignore(root: str) -> IgnoreSpec:
+    """IgnoreSpec for `root`: the defaults plus `root/.gitignore`, cached per file version."""
+    gitignore = os.path.join(root, ".gitignore")
+    try:
+        mtime_ns = os.stat(gitignore).st_mtime_ns
+    except OSError:
+        mtime_ns = -1
+    return _load(gitignore, mtime_ns)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+import os
+import tempfile
+import unittest
+
+from pyopencode.tools.base import ToolContext
+from pyopencode.tools.builtin_tools.glob_tool import GlobTool
+
+
+@unittest.skipUnless(hasattr(os, "symlink"), "needs symlinks")
+class GlobSymlinkTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        root = os.path.realpath(self._tmp.name)
+        self.cwd = os.path.join(root, "ws")
+        outside = os.path.join(root, "outside")
+        os.makedirs(os.path.join(self.cwd, "src"))
+        os.makedirs(outside)
+        with open(os.path.join(self.cwd, "src", "a.py"), "w") as f:
+            f.write("x\n")
+        with open(os.path.join(outside, "secret.py"), "w") as f:
+            f.write("x\n")
+        os.symlink(outside, os.path.join(self.cwd, "link"))
+
+    def _glob(self, pattern: str) -> str:
+        return GlobTool().execute(ToolContext(cwd=self.cwd), {"pattern": pattern}).content
+
+    def test_recursive_glob_skips_escaping_symlink(self):
+        self.assertEqual(self._glob("**/*.py"), os.path.join("src", "a.py"))
+
+    def test_explicit_escaping_symlink_has_no_matches(self):
+        self.assertEqual(self._glob("link/*"), "(no matches)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+import os
+import tempfile
+import unittest
+
+from pyopencode.tools.base import ToolContext
+from pyopencode.tools.builtin_tools import grep_tool
+from pyopencode.tools.builtin_tools.file_read import ReadFileTool
+from pyopencode.tools.builtin_tools.grep_tool import GrepTool
+
+
+class GrepLineNumberTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.ctx = ToolContext(cwd=self._tmp.name)
+
+    def _write(self, name: str, data: bytes) -> None:
+        # Above the mmap threshold, so the byte-level scan is exercised.
+        self.assertGreaterEqual(len(data), grep_tool._MMAP_MIN_BYTES)
+        with open(os.path.join(self._tmp.name, name), "wb") as f:
+            f.write(data)
+
+    def _grep_then_read(self, name: str, needle: str) -> tuple[str, str]:
+        hit = GrepTool().execute(self.ctx, {"pattern": needle, "path": name}).content
+        line_no = int(hit.split(":")[1])
+        line = ReadFileTool().execute(
+            self.ctx, {"path": name, "start_line": line_no, "end_line": line_no}
+        ).content
+        return hit, line
+
+    def test_lone_cr_lines_match_read(self):
+        progress = b"".join(b"progress %d%%\r" % (i % 100) for i in range(2000))
+        self._write("build.log", b"start\n" + progress + b"ERROR boom\nend\n")
+        hit, line = self._grep_then_read("build.log", "ERROR")
+        self.assertEqual(hit, "build.log:2002: ERROR boom")
+        self.assertEqual(line, "ERROR boom")
+
+    def test_crlf_lines_match_read(self):
+        body = b"".join(b"line %d\r\n" % i for i in range(3000))
+        self._write("crlf.txt", body + b"needle here\r\n")
+        hit, line = self._grep_then_read("crlf.txt", "needle")
+        self.assertEqual(hit, "crlf.txt:3001: needle here")
+        self.assertEqual(line, "needle here")
+
+
+if __name__ == "__main__":
+    unittest.main()
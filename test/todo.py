@@ -3,6 +3,7 @@ Todo与TodoList模块
 支持添加、删除、完成标记与查询
 """
 
+from collections import defaultdict
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
@@ -24,6 +25,13 @@ class TodoStatus(Enum):
     CANCELLED = "已取消"
 
 
+def _to_datetime(value: Any) -> datetime:
+    """时间戳转datetime; 兼容旧文件中的ISO格式字符串"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value)
+
+
 @dataclass
 class Todo:
     """Todo任务类"""
@@ -37,6 +45,18 @@ class Todo:
     updated_at: datetime = field(default_factory=datetime.now)
     due_date: Optional[datetime] = None
     tags: List[str] = field(default_factory=list)
+    # 包含该Todo的所有TodoList(由add_todo登记), 用于在状态/优先级/标签变化时同步各自的索引
+    _owners: List["TodoList"] = field(default_factory=list, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        owners = self.__dict__.get("_owners")
+        if owners and name in _INDEXED_FIELDS:
+            old = self.__dict__.get(name)
+            object.__setattr__(self, name, value)
+            for owner in owners:
+                owner._reindex(self, name, old, value)
+        else:
+            object.__setattr__(self, name, value)
     
     def __post_init__(self):
         """初始化后处理"""
@@ -81,12 +101,17 @@ class Todo:
         """添加标签"""
         if tag and tag not in self.tags:
             self.tags.append(tag)
+            for owner in self._owners:
+                owner._by_tag[tag][self.id] = self
             self.updated_at = datetime.now()
     
     def remove_tag(self, tag: str) -> None:
         """移除标签"""
         if tag in self.tags:
             self.tags.remove(tag)
+            if tag not in self.tags:
+                for owner in self._owners:
+                    owner._by_tag[tag].pop(self.id, None)
             self.updated_at = datetime.now()
     
     def set_due_date(self, due_date: Optional[datetime]) -> None:
@@ -102,9 +127,10 @@ class Todo:
             "description": self.description,
             "priority": self.priority.value,
             "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "due_date": self.due_date.isoformat() if self.due_date else None,
+            # POSIX时间戳(float), 比isoformat/fromisoformat往返更快
+            "created_at": self.created_at.timestamp(),
+            "updated_at": self.updated_at.timestamp(),
+            "due_date": self.due_date.timestamp() if self.due_date else None,
             "tags": self.tags
         }
     
@@ -112,9 +138,9 @@ class Todo:
     def from_dict(cls, data: Dict[str, Any]) -> 'Todo':
         """从字典创建Todo"""
         # 处理datetime字段
-        created_at = datetime.fromisoformat(data["created_at"]) if data["created_at"] else datetime.now()
-        updated_at = datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else datetime.now()
-        due_date = datetime.fromisoformat(data["due_date"]) if data["due_date"] else None
+        created_at = _to_datetime(data["created_at"]) if data["created_at"] else datetime.now()
+        updated_at = _to_datetime(data["updated_at"]) if data["updated_at"] else datetime.now()
+        due_date = _to_datetime(data["due_date"]) if data["due_date"] else None
         
         # 处理枚举字段
         priority_map = {p.value: p for p in Priority}
@@ -133,8 +159,15 @@ class Todo:
         )
 
 
+_INDEXED_FIELDS = frozenset({"status", "priority", "tags"})
+
+
 class TodoList:
-    """Todo列表管理类"""
+    """Todo列表管理类
+    
+    按状态/优先级/标签维护索引(id -> Todo), 筛选与统计无需全表扫描; 筛选结果按Todo在列表中的顺序返回。
+    通过Todo的方法或属性赋值修改都会同步索引; 直接修改todo.tags列表或self.todos字典不会。
+    """
     
     def __init__(self, name: str = "默认列表"):
         """
@@ -145,6 +178,60 @@ class TodoList:
         """
         self.name = name
         self.todos: Dict[str, Todo] = {}
+        self._by_status: Dict[TodoStatus, Dict[str, Todo]] = {s: {} for s in TodoStatus}
+        self._by_priority: Dict[Priority, Dict[str, Todo]] = {p: {} for p in Priority}
+        self._by_tag: Dict[str, Dict[str, Todo]] = defaultdict(dict)
+        # id -> 加入列表的序号, 用于让索引结果保持self.todos的顺序
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+    
+    def _index(self, todo: Todo) -> None:
+        """将Todo加入各索引"""
+        self._by_status[todo.status][todo.id] = todo
+        self._by_priority[todo.priority][todo.id] = todo
+        for tag in todo.tags:
+            self._by_tag[tag][todo.id] = todo
+    
+    def _unindex(self, todo: Todo) -> None:
+        """将Todo从各索引移除"""
+        self._by_status[todo.status].pop(todo.id, None)
+        self._by_priority[todo.priority].pop(todo.id, None)
+        for tag in todo.tags:
+            bucket = self._by_tag.get(tag)
+            if bucket is not None:
+                bucket.pop(todo.id, None)
+    
+    def _reindex(self, todo: Todo, name: str, old: Any, new: Any) -> None:
+        """字段name由old改为new后, 只更新该字段对应的索引"""
+        if name == "tags":
+            for tag in old or ():
+                bucket = self._by_tag.get(tag)
+                if bucket is not None:
+                    bucket.pop(todo.id, None)
+            for tag in new:
+                self._by_tag[tag][todo.id] = todo
+            return
+        index = self._by_status if name == "status" else self._by_priority
+        index[old].pop(todo.id, None)
+        index[new][todo.id] = todo
+    
+    def _ordered(self, bucket: Dict[str, Todo]) -> List[Todo]:
+        """按列表顺序返回分组内的Todo(分组通常已有序, 排序接近线性)"""
+        seq = self._seq
+        return sorted(bucket.values(), key=lambda t: seq[t.id])
+    
+    def _insert(self, todo_id: str, todo: Todo) -> None:
+        self.todos[todo_id] = todo
+        self._seq[todo_id] = self._next_seq
+        self._next_seq += 1
+        self._index(todo)
+        todo._owners.append(self)
+    
+    def _discard(self, todo_id: str) -> None:
+        todo = self.todos.pop(todo_id)
+        del self._seq[todo_id]
+        self._unindex(todo)
+        todo._owners.remove(self)
     
     def add_todo(self, todo: Todo) -> None:
         """
@@ -158,7 +245,7 @@ class TodoList:
         """
         if todo.id in self.todos:
             raise ValueError(f"Todo ID '{todo.id}' 已存在")
-        self.todos[todo.id] = todo
+        self._insert(todo.id, todo)
     
     def create_todo(self, title: str, description: str = "", **kwargs) -> Todo:
         """
@@ -195,7 +282,7 @@ class TodoList:
             是否成功移除
         """
         if todo_id in self.todos:
-            del self.todos[todo_id]
+            self._discard(todo_id)
             return True
         return False
     
@@ -230,7 +317,7 @@ class TodoList:
         Returns:
             符合条件的Todo列表
         """
-        return [todo for todo in self.todos.values() if todo.status == status]
+        return self._ordered(self._by_status[status])
     
     def get_todos_by_priority(self, priority: Priority) -> List[Todo]:
         """
@@ -242,7 +329,7 @@ class TodoList:
         Returns:
             符合条件的Todo列表
         """
-        return [todo for todo in self.todos.values() if todo.priority == priority]
+        return self._ordered(self._by_priority[priority])
     
     def get_todos_with_tag(self, tag: str) -> List[Todo]:
         """
@@ -254,7 +341,8 @@ class TodoList:
         Returns:
             符合条件的Todo列表
         """
-        return [todo for todo in self.todos.values() if tag in todo.tags]
+        bucket = self._by_tag.get(tag)
+        return self._ordered(bucket) if bucket else []
     
     def get_overdue_todos(self) -> List[Todo]:
         """
@@ -264,9 +352,10 @@ class TodoList:
             过期的Todo列表
         """
         now = datetime.now()
+        completed = TodoStatus.COMPLETED
         return [
             todo for todo in self.todos.values()
-            if todo.due_date and todo.due_date < now and todo.status != TodoStatus.COMPLETED
+            if todo.due_date is not None and todo.due_date < now and todo.status is not completed
         ]
     
     def get_todos_due_today(self) -> List[Todo]:
@@ -282,7 +371,7 @@ class TodoList:
         
         return [
             todo for todo in self.todos.values()
-            if todo.due_date and today_start <= todo.due_date <= today_end
+            if todo.due_date is not None and today_start <= todo.due_date <= today_end
         ]
     
     def mark_todo_completed(self, todo_id: str) -> bool:
@@ -356,15 +445,11 @@ class TodoList:
         Returns:
             清除的数量
         """
-        completed_ids = [
-            todo_id for todo_id, todo in self.todos.items()
-            if todo.status == TodoStatus.COMPLETED
-        ]
-        
-        for todo_id in completed_ids:
-            del self.todos[todo_id]
+        completed = list(self._by_status[TodoStatus.COMPLETED].values())
+        for todo in completed:
+            self._discard(todo.id)
         
-        return len(completed_ids)
+        return len(completed)
     
     def count_by_status(self) -> Dict[TodoStatus, int]:
         """
@@ -373,10 +458,7 @@ class TodoList:
         Returns:
             状态到数量的映射
         """
-        counts = {status: 0 for status in TodoStatus}
-        for todo in self.todos.values():
-            counts[todo.status] += 1
-        return counts
+        return {status: len(self._by_status[status]) for status in TodoStatus}
     
     def count_by_priority(self) -> Dict[Priority, int]:
         """
@@ -385,10 +467,7 @@ class TodoList:
         Returns:
             优先级到数量的映射
         """
-        counts = {priority: 0 for priority in Priority}
-        for todo in self.todos.values():
-            counts[todo.priority] += 1
-        return counts
+        return {priority: len(self._by_priority[priority]) for priority in Priority}
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -403,7 +482,7 @@ class TodoList:
         todo_list = cls(name=data["name"])
         for todo_id, todo_data in data["todos"].items():
             todo = Todo.from_dict(todo_data)
-            todo_list.todos[todo_id] = todo
+            todo_list._insert(todo_id, todo)
         return todo_list
     
     def save_to_file(self, filepath: str) -> None:
@@ -414,8 +493,10 @@ class TodoList:
             filepath: 文件路径
         """
         import json
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        # 一次序列化为紧凑字节串后整体写入(json.dump会逐块多次写文件)
+        data = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with open(filepath, 'wb') as f:
+            f.write(data)
     
     @classmethod
     def load_from_file(cls, filepath: str) -> 'TodoList':
@@ -429,8 +510,8 @@ class TodoList:
             TodoList对象
         """
         import json
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = json.loads(f.read())
         return cls.from_dict(data)
 
 